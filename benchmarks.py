@@ -0,0 +1,244 @@
+import math
+import numpy as np
+
+from abc import ABC, abstractmethod
+
+from chromosome import Chromosome
+from constants import DELTA, SIGMA
+from population_factory import PopulationFactory
+from coding import decode_batch, encode_batch
+
+
+class RealBenchmark(ABC):
+    # D-dimensional real argument function: every dimension takes `bits` bits of the
+    # genotype and fitness is the negated cost, so the optimum has fitness 0.
+    def __init__(self, dimensions: int, bits: int, a: float, b: float, x_optimal: float):
+        self.dimensions = dimensions
+        self.bits = bits
+        self.a = a
+        self.b = b
+        self.x_optimal = x_optimal
+        self.x = (self.a, self.b)
+        self.y = (
+            self.score(np.full((1, dimensions), self.a, dtype=np.float64))[0],
+            self.score(np.full((1, dimensions), x_optimal, dtype=np.float64))[0],
+        )
+        self.optimals = {}
+        self.factory = PopulationFactory(self)
+
+    def score(self, x: np.ndarray) -> np.ndarray:
+        return -self.cost(x)
+
+    @abstractmethod
+    def cost(self, x: np.ndarray) -> np.ndarray:
+        pass
+
+    def check_length(self, length: int):
+        if length != self.dimensions * self.bits:
+            raise ValueError(
+                f"Genotype length {length} does not match {self.dimensions} dimensions of {self.bits} bits"
+            )
+
+    def decode(self, chromosome_codes):
+        chromosome_codes = np.asarray(chromosome_codes, dtype=np.uint8)
+        self.check_length(chromosome_codes.shape[1])
+        codes = chromosome_codes.reshape(len(chromosome_codes), self.dimensions, self.bits)
+        return decode_batch(codes, self.a, self.b, self.bits)
+
+    def estimate(self, chromosome_code):
+        return self.estimate_batch(np.asarray(chromosome_code)[None, :])[0]
+
+    def estimate_batch(self, chromosome_codes):
+        return self.score(self.decode(chromosome_codes))
+
+    def get_genotype_value(self, chromosome_code):
+        return float(self.decode(np.asarray(chromosome_code)[None, :]).mean())
+
+    def generate_optimal(self, length):
+        if length not in self.optimals:
+            self.check_length(length)
+            coding = encode_batch(np.full((self.dimensions,), self.x_optimal), self.a, self.b, self.bits).ravel()
+            self.optimals[length] = Chromosome(coding, self.estimate(coding))
+        return self.optimals[length]
+
+    def get_optimal(self, n, l):
+        return self.generate_optimal(l)
+
+    def generate_population(self, n, l, rng=None):
+        return self.factory.generate(n, l, rng)
+
+    def check_chromosome_success(self, chromosome: Chromosome):
+        return bool(self.check_success_batch(np.asarray(chromosome.code)[None, :])[0])
+
+    def check_success_batch(self, chromosome_codes):
+        x = self.decode(chromosome_codes)
+        y = self.score(x)
+        y_max = self.y[1]
+        return (np.abs(y_max - y) <= DELTA) & (np.abs(self.x_optimal - x) <= SIGMA).all(axis=1)
+
+
+class Sphere(RealBenchmark):
+    def __init__(self, dimensions: int = 10, bits: int = 10):
+        super().__init__(dimensions, bits, -5.12, 5.11, 0)
+
+    def cost(self, x):
+        return np.sum(x**2, axis=-1)
+
+    def __repr__(self):
+        return f"Sphere[D={self.dimensions}]"
+
+
+class Rastrigin(RealBenchmark):
+    def __init__(self, dimensions: int = 10, bits: int = 10):
+        super().__init__(dimensions, bits, -5.12, 5.11, 0)
+
+    def cost(self, x):
+        return 10 * x.shape[-1] + np.sum(x**2 - 10 * np.cos(2 * math.pi * x), axis=-1)
+
+    def __repr__(self):
+        return f"Rastrigin[D={self.dimensions}]"
+
+
+class Rosenbrock(RealBenchmark):
+    def __init__(self, dimensions: int = 10, bits: int = 12):
+        super().__init__(dimensions, bits, -2.048, 2.047, 1)
+
+    def cost(self, x):
+        return np.sum(100 * (x[..., 1:] - x[..., :-1] ** 2) ** 2 + (1 - x[..., :-1]) ** 2, axis=-1)
+
+    def __repr__(self):
+        return f"Rosenbrock[D={self.dimensions}]"
+
+
+class Ackley(RealBenchmark):
+    def __init__(self, dimensions: int = 10, bits: int = 16):
+        super().__init__(dimensions, bits, -32.768, 32.767, 0)
+
+    def cost(self, x):
+        d = x.shape[-1]
+        return (
+            -20 * np.exp(-0.2 * np.sqrt(np.sum(x**2, axis=-1) / d))
+            - np.exp(np.sum(np.cos(2 * math.pi * x), axis=-1) / d)
+            + 20
+            + math.e
+        )
+
+    def __repr__(self):
+        return f"Ackley[D={self.dimensions}]"
+
+
+class BinaryBenchmark:
+    # Bit string function whose optimum is known in closed form (or by dynamic programming),
+    # plotted by the amount of ones like FHD.
+    def __init__(self, length: int):
+        self.a = 0
+        self.b = length
+        self.x = (self.a, self.b)
+        self.optimals = {}
+        self.factory = PopulationFactory(self)
+
+    def estimate(self, chromosome_code):
+        return self.estimate_batch(np.asarray(chromosome_code)[None, :])[0]
+
+    def get_genotype_value(self, chromosome_code):
+        return np.count_nonzero(chromosome_code)
+
+    def generate_optimal(self, length):
+        if length not in self.optimals:
+            coding = self.optimal_code(length)
+            self.optimals[length] = Chromosome(coding, self.estimate(coding))
+        return self.optimals[length]
+
+    def get_optimal(self, n, l):
+        return self.generate_optimal(l)
+
+    def generate_population(self, n, l, rng=None):
+        return self.factory.generate(n, l, rng)
+
+    def check_chromosome_success(self, chromosome: Chromosome):
+        return bool(self.check_success_batch(np.asarray(chromosome.code)[None, :])[0])
+
+    def check_success_batch(self, chromosome_codes):
+        y_max = self.generate_optimal(chromosome_codes.shape[1]).fitness
+        return np.abs(y_max - self.estimate_batch(chromosome_codes)) <= DELTA
+
+
+class DeceptiveTrap(BinaryBenchmark):
+    def __init__(self, length: int = 100, k: int = 5):
+        if k < 1 or length % k != 0:
+            raise ValueError(f"Trap length {length} must be a multiple of the block size {k}")
+        self.k = k
+        super().__init__(length)
+        self.y = (0, length)
+
+    def estimate_batch(self, chromosome_codes):
+        chromosome_codes = np.asarray(chromosome_codes, dtype=np.uint8)
+        blocks = chromosome_codes.reshape(len(chromosome_codes), -1, self.k)
+        ones = np.count_nonzero(blocks, axis=2)
+        return np.where(ones == self.k, self.k, self.k - 1 - ones).sum(axis=1).astype(np.float64)
+
+    def optimal_code(self, length):
+        return np.ones((length,), dtype=int)
+
+    def __repr__(self):
+        return f"Trap[k={self.k}]"
+
+
+class NKLandscape(BinaryBenchmark):
+    # Every bit contributes a random value looked up by itself and its k right neighbours,
+    # bits past the end of the chain count as zeros.
+    def __init__(self, length: int = 100, k: int = 2, seed: int = 0):
+        if k < 0:
+            raise ValueError(f"NK neighbourhood size must not be negative, got k={k}")
+        self.length = length
+        self.k = k
+        self.seed = seed
+        self.contributions = np.random.default_rng(seed).random((length, 2 ** (k + 1)))
+        super().__init__(length)
+        self.y = (0, self.generate_optimal(length).fitness)
+
+    def windows(self, chromosome_codes):
+        n, l = chromosome_codes.shape
+        padded = np.zeros((n, l + self.k), dtype=np.int64)
+        padded[:, :l] = chromosome_codes
+        windows = np.zeros((n, l), dtype=np.int64)
+        for shift in range(self.k + 1):
+            windows = (windows << 1) | padded[:, shift : shift + l]
+        return windows
+
+    def estimate_batch(self, chromosome_codes):
+        chromosome_codes = np.asarray(chromosome_codes, dtype=np.uint8)
+        windows = self.windows(chromosome_codes)
+        return self.contributions[np.arange(self.length), windows].mean(axis=1)
+
+    def optimal_code(self, length):
+        if self.k == 0:
+            # Without neighbours every bit takes its better contribution on its own.
+            return self.contributions[:length].argmax(axis=1).astype(int)
+
+        # Dynamic programming over the last k bits: appending bit j closes the window of bit j - k.
+        states = 2**self.k
+        high = 1 << (self.k - 1)
+        next_states = np.arange(states)
+        values = np.zeros((states,), dtype=np.float64)
+        choices = []
+        for j in range(self.k, length + self.k):
+            contributions = self.contributions[j - self.k]
+            without_high = values[next_states >> 1] + contributions[next_states]
+            with_high = values[(next_states >> 1) | high] + contributions[next_states | states]
+            if j >= length:
+                without_high[next_states & 1 == 1] = -np.inf
+                with_high[next_states & 1 == 1] = -np.inf
+            choices.append(with_high > without_high)
+            values = np.maximum(without_high, with_high)
+
+        state = int(values.argmax())
+        bits = []
+        for choice in reversed(choices):
+            bits.append(state & 1)
+            state = (state >> 1) | (high if choice[state] else 0)
+        bits.extend((state >> shift) & 1 for shift in range(self.k))
+        return np.array(bits[::-1][:length], dtype=int)
+
+    def __repr__(self):
+        return f"NK[k={self.k}]"
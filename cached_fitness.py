@@ -0,0 +1,69 @@
+import numpy as np
+
+from collections import OrderedDict
+from packing import pack, genotype_keys
+
+
+class CachedFitness:
+    def __init__(self, fitness_function, size: int):
+        self.fitness_function = fitness_function
+        self.size = size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getattr__(self, name):
+        if name == "fitness_function":
+            raise AttributeError(name)
+        return getattr(self.fitness_function, name)
+
+    def estimate(self, chromosome_code):
+        return self.estimate_batch(np.asarray(chromosome_code)[None, :])[0]
+
+    def estimate_batch(self, chromosome_codes, evaluate=None):
+        # Misses are scored by evaluate(fitness_function, codes) when given, so an evaluator can
+        # spread them over its workers while the cache itself is only touched by the caller.
+        chromosome_codes = np.asarray(chromosome_codes, dtype=np.uint8)
+        length = chromosome_codes.shape[1]
+        keys = [(length, key) for key in genotype_keys(pack(chromosome_codes)).tolist()]
+        fitness = np.empty((len(keys),), dtype=np.float64)
+
+        missing = {}
+        for index, key in enumerate(keys):
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                fitness[index] = self.cache[key]
+                self.hits += 1
+            else:
+                missing.setdefault(key, []).append(index)
+
+        if missing:
+            first_indices = [indices[0] for indices in missing.values()]
+            if evaluate is None:
+                estimated = self.fitness_function.estimate_batch(chromosome_codes[first_indices])
+            else:
+                estimated = evaluate(self.fitness_function, chromosome_codes[first_indices])
+            for (key, indices), value in zip(missing.items(), estimated):
+                fitness[indices] = value
+                self.misses += 1
+                self.hits += len(indices) - 1
+                self.cache[key] = value
+            while len(self.cache) > self.size:
+                self.cache.popitem(last=False)
+                self.evictions += 1
+
+        return fitness
+
+    def __str__(self):
+        return (
+            "Hits: "
+            + str(self.hits)
+            + " Misses: "
+            + str(self.misses)
+            + " Evictions: "
+            + str(self.evictions)
+        )
+
+    def __repr__(self):
+        return repr(self.fitness_function)
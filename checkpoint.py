@@ -0,0 +1,97 @@
+import json
+import os
+import pickle
+import shutil
+
+from constants import (
+    env,
+    SEED,
+    N,
+    G,
+    MAX_RUNS,
+    ITERATIONS_TO_REPORT,
+    ENSEMBLE_SIZE,
+    ENCODING,
+    PACKED,
+    DELTA,
+    SIGMA,
+    CROSSOVER,
+    CROSSOVER_POINTS,
+)
+
+
+CHECKPOINT_PATH = f"Checkpoints/{N}"
+
+
+def get_fitness_settings(fitness_config) -> list:
+    fitness_function, *population_arguments = fitness_config
+    parameters = {
+        name: value for name, value in vars(fitness_function).items() if isinstance(value, (int, float, str))
+    }
+    return [repr(fitness_function), parameters, *population_arguments]
+
+
+def get_sweep_settings(fitness_configs, arguments, selection_methods) -> dict:
+    # Settings that decide how runs are batched and what they produce, a sweep only resumes
+    # from checkpoints written with the same ones. The order of the selection methods and
+    # arguments decides the seed stream of every run, so it is kept as well.
+    return {
+        "env": env,
+        "seed": SEED,
+        "N": N,
+        "G": G,
+        "runs": MAX_RUNS,
+        "reported_runs": ITERATIONS_TO_REPORT,
+        "ensemble_size": ENSEMBLE_SIZE,
+        "encoding": ENCODING,
+        "crossover": CROSSOVER,
+        "crossover_points": CROSSOVER_POINTS,
+        "packed": PACKED,
+        "delta": DELTA,
+        "sigma": SIGMA,
+        "fitness_configs": [get_fitness_settings(fitness_config) for fitness_config in fitness_configs],
+        "arguments": [[repr(argument) for argument in config_arguments] for config_arguments in arguments],
+        "selection_methods": [repr(selection_method) for selection_method in selection_methods],
+    }
+
+
+def prepare_checkpoints(resume: bool, fitness_configs, arguments, selection_methods):
+    path = f"{CHECKPOINT_PATH}/sweep.json"
+    # Round trip through JSON so the settings compare equal to the saved ones.
+    settings = json.loads(json.dumps(get_sweep_settings(fitness_configs, arguments, selection_methods)))
+    if resume and os.path.exists(path):
+        with open(path) as file:
+            saved_settings = json.load(file)
+        if saved_settings != settings:
+            changed = [name for name in settings if saved_settings.get(name) != settings[name]]
+            raise ValueError(f"Checkpoints in {CHECKPOINT_PATH} were written by a different sweep, changed: {changed}")
+        return
+    if os.path.exists(CHECKPOINT_PATH):
+        shutil.rmtree(CHECKPOINT_PATH)
+    os.makedirs(CHECKPOINT_PATH, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(settings, file, indent=1)
+
+
+def get_checkpoint_path(config_index: int, file_name: str, sf_name: str, runs: list[int]) -> str:
+    return f"{CHECKPOINT_PATH}/{config_index}/{file_name}/{sf_name}/{runs[0]}-{runs[-1]}"
+
+
+def save_checkpoint(path: str, value):
+    # Written next to the old file and swapped in, so a crash never leaves half a checkpoint.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "wb") as file:
+        pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{path}.tmp", path)
+
+
+def load_checkpoint(path: str):
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        return pickle.load(file)
+
+
+def remove_checkpoint(path: str):
+    if os.path.exists(path):
+        os.remove(path)
@@ -1,8 +1,12 @@
 import math
+import numpy as np
 
 from constants import ENCODING
 
 
+WORD_BITS = 32
+
+
 def flip_num(num):
     return 0 if num != 0 else 1
 
@@ -62,20 +66,68 @@ def decimal_to_binary(decimal, size):
     return binary.zfill(size)
 
 
-def encode(x, a, b, m):
+def gray_to_binary_batch(codes):
+    return np.bitwise_xor.accumulate(codes, axis=-1)
+
+
+def binary_to_gray_batch(codes):
+    gray = codes.copy()
+    gray[..., 1:] ^= codes[..., :-1]
+    return gray
+
+
+def binary_to_decimal_batch(codes):
+    # Rows up to 63 bits are decoded exactly in int64, longer rows are split
+    # into 32-bit words that are combined in float64 from the most significant one.
+    m = codes.shape[-1]
+    if m <= 63:
+        return codes.astype(np.int64) @ np.left_shift(1, np.arange(m - 1, -1, -1, dtype=np.int64))
+    words = -(-m // WORD_BITS)
+    padded = np.zeros(codes.shape[:-1] + (words * WORD_BITS,), dtype=np.int64)
+    padded[..., words * WORD_BITS - m :] = codes
+    powers = np.left_shift(1, np.arange(WORD_BITS - 1, -1, -1, dtype=np.int64))
+    chunks = padded.reshape(codes.shape[:-1] + (words, WORD_BITS)) @ powers
+    decimals = np.zeros(codes.shape[:-1], dtype=np.float64)
+    for word in range(words):
+        decimals = decimals * 2.0**WORD_BITS + chunks[..., word]
+    return decimals
+
+
+def decimal_to_binary_batch(decimals, m):
+    # Integral float64 values are exact up to 53 bits, wider codes go through Python ints.
+    if m <= 53:
+        shifts = np.arange(m - 1, -1, -1, dtype=np.int64)
+        return ((decimals.astype(np.int64)[..., None] >> shifts) & 1).astype(np.uint8)
+    size = -(-m // 8)
+    codes = [
+        np.unpackbits(np.frombuffer(min(int(decimal), (1 << m) - 1).to_bytes(size, "big"), dtype=np.uint8))[-m:]
+        for decimal in decimals.ravel()
+    ]
+    return np.array(codes, dtype=np.uint8).reshape(decimals.shape + (m,))
+
+
+def encode_batch(xs, a, b, m):
     step = (math.pow(2, m) - 1) / (b - a)
-    n = round((x - a) * step)
-    code = decimal_to_gray(n, m) if ENCODING == "gray" else decimal_to_binary(n, m)
-    code = chars2ints(code)
-    return code
+    n = np.rint((np.asarray(xs, dtype=np.float64) - a) * step)
+    # Like zfill in decimal_to_binary, a zero-width code still keeps one bit.
+    codes = decimal_to_binary_batch(n, max(m, 1))
+    return binary_to_gray_batch(codes) if ENCODING == "gray" else codes
 
 
-def decode(code, a, b, m):
-    code = ints2chars(code)
+def decode_batch(codes, a, b, m):
+    codes = np.asarray(codes, dtype=np.uint8)
     step = (b - a) / (math.pow(2, m) - 1)
-    n = gray_to_decimal(code) if ENCODING == "gray" else binary_to_decimal(code)
-    x = round(a + n * step, 2)
-    return x
+    codes = gray_to_binary_batch(codes) if ENCODING == "gray" else codes
+    n = binary_to_decimal_batch(codes)
+    return np.round(a + n * step, 2)
+
+
+def encode(x, a, b, m):
+    return encode_batch([x], a, b, m)[0].tolist()
+
+
+def decode(code, a, b, m):
+    return float(decode_batch(np.asarray(code)[None, :], a, b, m)[0])
 
 
 def ints2chars(ints):
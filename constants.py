@@ -1,12 +1,35 @@
-env = "release"
+env = "release" # "release", "test" or "benchmark"
 
 # Config: amount of evolutionary algorithms / iterations to probe and report.
 MAX_RUNS = 5 if env == "test" else 100
 ITERATIONS_TO_REPORT = 3 if env == "test" else 5
 
+# Randomness: experiment seed, every run draws from its own stream spawned from it.
+SEED = 0
+
 # Genotype: amount of chromosomes in population / codec.
 N = 200
 ENCODING = "binary" # "binary" or "gray"
+LOOKUP_TABLE_LIMIT = 2**16 # real argument genotypes with up to this many values are scored from a table
+PACKED = False # store genotypes bit-packed into uint64 words (for long chains)
+
+# Crossover: tail swap after one point, segments between several points or per-bit coin flips.
+CROSSOVER = "single-point" # "single-point", "multi-point" or "uniform"
+CROSSOVER_POINTS = 2
+
+# Ensemble: runs of a configuration advanced together as one tensor (1 runs them one by one).
+ENSEMBLE_SIZE = 25
+
+# Checkpoints: generations between snapshots of runs in progress, finished runs are always saved (0 disables snapshots).
+CHECKPOINT_INTERVAL = 50
+
+# Fitness cache: genotypes remembered per fitness function and worker (0 disables caching).
+FITNESS_CACHE_SIZE = 0
+
+# Fitness evaluation backend: pending genotypes of a generation are scored in chunks by persistent workers.
+EVALUATOR = "serial" # "serial", "thread" or "process"
+EVALUATOR_WORKERS = 4
+EVALUATOR_CHUNK_SIZE = 50
 
 # Termination condition: maximum amount of iterations.
 G = 100 if env == "test" else 1000
@@ -0,0 +1,48 @@
+import numpy as np
+
+from constants import CROSSOVER, CROSSOVER_POINTS
+from packing import pack, suffix_words
+
+
+def single_point_cuts(pairs: int, length: int, rng: np.random.Generator) -> np.ndarray:
+    return (rng.random(pairs) * length).astype(np.int64)
+
+
+def single_point_masks(pairs: int, length: int, rng: np.random.Generator) -> np.ndarray:
+    points = single_point_cuts(pairs, length, rng)
+    return np.arange(length) >= points[:, None]
+
+
+def multi_point_cuts(pairs: int, length: int, points: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.integers(0, length, size=(pairs, points))
+
+
+def multi_point_masks(pairs: int, length: int, points: int, rng: np.random.Generator) -> np.ndarray:
+    cuts = multi_point_cuts(pairs, length, points, rng)
+    crossed = (np.arange(length)[None, None, :] >= cuts[:, :, None]).sum(axis=1)
+    return crossed % 2 == 1
+
+
+def uniform_masks(pairs: int, length: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.random((pairs, length)) < 0.5
+
+
+def crossover_masks(pairs: int, length: int, rng: np.random.Generator) -> np.ndarray:
+    if CROSSOVER == "multi-point":
+        return multi_point_masks(pairs, length, CROSSOVER_POINTS, rng)
+    elif CROSSOVER == "uniform":
+        return uniform_masks(pairs, length, rng)
+    else:
+        return single_point_masks(pairs, length, rng)
+
+
+def crossover_words_batch(pairs: int, length: int, rngs: list[np.random.Generator]) -> np.ndarray:
+    # Bit-packed masks of several populations, every population draws from its own generator.
+    # Cut point masks are built word by word: the bits past every cut are flipped in turn.
+    if CROSSOVER == "multi-point":
+        cuts = np.stack([multi_point_cuts(pairs, length, CROSSOVER_POINTS, rng) for rng in rngs])
+        return np.bitwise_xor.reduce(suffix_words(cuts, length), axis=-2)
+    elif CROSSOVER == "uniform":
+        return pack(np.stack([uniform_masks(pairs, length, rng) for rng in rngs]))
+    else:
+        return suffix_words(np.stack([single_point_cuts(pairs, length, rng) for rng in rngs]), length)
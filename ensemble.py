@@ -0,0 +1,361 @@
+import time
+
+import numpy as np
+
+from pressure_stats import PressureStats
+from selection_diff_stats import SelectionDiffStats
+from reproduction_stats import ReproductionStats
+from noise_stats import NoiseStats
+from run import Run, GENERATION_DTYPE
+from population import Population
+from crossover import crossover_words_batch
+from mutation import mutation_positions
+from packing import pack, unpack, flip_bits
+from evaluator import get_evaluator
+from checkpoint import save_checkpoint, load_checkpoint
+from timing import STAGES, StageTimings
+from constants import G, N, CHECKPOINT_INTERVAL
+
+
+HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class PhenotypesView:
+    # Selection operators only read the fitness vector and the size of a population.
+    def __init__(self, phenotypes: np.ndarray):
+        self.phenotypes = phenotypes
+
+    def __len__(self):
+        return len(self.phenotypes)
+
+
+class EnsembleEvoAlgorithm:
+    # Advances R independent runs of the same configuration in lockstep: genotypes live in one
+    # R x N x L tensor, bit-packed into words, and every step is a single array operation over
+    # all runs still going.
+    # Each run draws from its own generator in the same order as EvoAlgorithm, so a run ends
+    # with exactly the statistics it would have had on its own.
+    def __init__(
+        self,
+        initial_populations: list[Population],
+        selection_function,
+        fitness_function,
+        optimal,
+        p_m: float | None,
+        p_c: float | None,
+        rngs: list[np.random.Generator] | None = None,
+        checkpoint: str | None = None,
+    ):
+        self.words = np.stack(
+            [population.genotypes if population.packed else pack(population.genotypes) for population in initial_populations]
+        )
+        self.phenotypes = np.stack([population.phenotypes for population in initial_populations])
+        self.length = initial_populations[0].length
+        self.selection_function = selection_function
+        self.fitness_function = fitness_function
+        self.optimal = optimal
+        self.optimal_chromosome = fitness_function.generate_optimal(self.length)
+        self.optimal_words = pack(np.asarray(self.optimal_chromosome.code, dtype=np.uint8))
+        self.p_m = p_m
+        self.p_c = p_c
+        if rngs is None:
+            rngs = [np.random.default_rng() for _ in initial_populations]
+        self.rngs = list(rngs)
+        # Slot i of the tensors holds run self.runs[i], finished runs are dropped from the tensors.
+        # Statistics stay indexed by run, all runs still going share the same iteration.
+        self.runs = np.arange(len(initial_populations))
+        self.iteration = 0
+        self.generations = np.zeros((len(initial_populations), G + 1), dtype=GENERATION_DTYPE)
+        self.grli = np.zeros((len(initial_populations),), dtype=np.int64)
+        # File the state of the runs is saved to every CHECKPOINT_INTERVAL generations and resumed from.
+        self.checkpoint = checkpoint
+        # Stage timings per run, the time of a stage is shared equally by the runs it advanced.
+        self.seconds = np.zeros((len(initial_populations), len(STAGES)))
+        self.calls = np.zeros((len(initial_populations), len(STAGES)), dtype=np.int64)
+        self.evaluations = np.zeros((len(initial_populations),), dtype=np.int64)
+
+    def run(self) -> list[Run]:
+        ff_name = repr(self.fitness_function)
+
+        state = load_checkpoint(self.checkpoint) if self.checkpoint else None
+        if state is None:
+            results = [None] * len(self.runs)
+            start = time.perf_counter()
+            self.record_statistics()
+            self.record("num_of_best", self.count_copies(self.get_best_genotypes()))
+            self.record("f_best", self.phenotypes.max(axis=1))
+            start = self.record_time("stats", start)
+            convergent = self.estimate_convergence()
+            self.record_time("convergence", start)
+        else:
+            results = self.set_state(state)
+            convergent = self.estimate_convergence()
+
+        while True:
+            finished = convergent | (self.iteration >= G)
+            for slot in np.flatnonzero(finished):
+                results[self.runs[slot]] = self.finish(slot, bool(convergent[slot]), ff_name)
+            if finished.any():
+                self.keep(~finished)
+                convergent = convergent[~finished]
+            if len(self.runs) == 0:
+                return results
+            convergent = self.step()
+            if self.checkpoint and CHECKPOINT_INTERVAL and self.iteration % CHECKPOINT_INTERVAL == 0:
+                save_checkpoint(self.checkpoint, self.get_state(results))
+
+    def step(self) -> np.ndarray:
+        runs = len(self.runs)
+        n = self.phenotypes.shape[1]
+        slots = np.arange(runs)[:, None]
+
+        start = time.perf_counter()
+        best = self.get_best_genotypes()
+        f_avg = self.avg_fitness
+        f_std = self.std_fitness
+
+        rngs = [self.rngs[run] for run in self.runs]
+        parents = self.get_parents(rngs)
+        offspring = np.zeros((runs, n), dtype=bool)
+        offspring[slots, parents] = True
+        reproduction_rate = np.count_nonzero(offspring, axis=1) / n
+        phenotypes = self.phenotypes[slots, parents]
+        f_parents_pool = phenotypes.mean(axis=1)
+        start = self.record_time("selection", start)
+
+        changed = np.zeros((runs, n), dtype=bool)
+        if self.p_c:
+            pairs = n // 2
+            orders = np.stack([rng.permutation(n) for rng in rngs])
+            masks = crossover_words_batch(pairs, self.length, rngs)
+            parents = parents[slots, orders]
+            phenotypes = phenotypes[slots, orders]
+            words = self.words[slots, parents]
+
+            first = words[:, 0 : 2 * pairs : 2]
+            second = words[:, 1 : 2 * pairs : 2]
+            swapped = (first ^ second) & masks
+            first ^= swapped
+            second ^= swapped
+            crossed = swapped.any(axis=2)
+            changed[:, 0 : 2 * pairs : 2] |= crossed
+            changed[:, 1 : 2 * pairs : 2] |= crossed
+        else:
+            words = self.words[slots, parents]
+        start = self.record_time("crossover", start)
+
+        if self.p_m:
+            size = n * self.length
+            positions = np.concatenate(
+                [mutation_positions(size, self.p_m, rng) + slot * size for slot, rng in enumerate(rngs)]
+            )
+            rows, columns = np.divmod(positions, self.length)
+            flip_bits(words.reshape(runs * n, -1), rows, columns)
+            changed.reshape(-1)[rows] = True
+        start = self.record_time("mutation", start)
+
+        self.words = words
+        self.phenotypes = phenotypes
+        self.evaluations[self.runs] += np.count_nonzero(changed, axis=1)
+        self.evaluate(np.flatnonzero(changed))
+        start = self.record_time("evaluation", start)
+        previous = self.generations[self.runs, self.iteration]
+        self.iteration += 1
+        self.record_statistics()
+        num_of_best = self.count_copies(best)
+        f_best = self.phenotypes.max(axis=1)
+        s = f_parents_pool - f_avg
+        # Same cases as PressureStats.calculate_intensity and calculate_growth_rate.
+        intensity = np.divide(s, f_std, out=np.ones((runs,)), where=f_std != 0)
+        same_best = (f_best == previous["f_best"]) & (previous["num_of_best"] > 0)
+        gr = np.divide(num_of_best, previous["num_of_best"], out=np.zeros((runs,)), where=same_best)
+
+        self.record("f_best", f_best)
+        self.record("num_of_best", num_of_best)
+        self.record("s", s)
+        self.record("intensity", intensity)
+        self.record("gr", gr)
+        self.record("rr", reproduction_rate)
+        self.record("best_rr", num_of_best / n)
+        late = self.runs[(num_of_best >= N / 2) & (self.grli[self.runs] == 0)]
+        self.grli[late] = self.iteration
+        start = self.record_time("stats", start)
+
+        convergent = self.estimate_convergence()
+        self.record_time("convergence", start)
+        return convergent
+
+    def record_time(self, stage: str, start: float) -> float:
+        end = time.perf_counter()
+        column = STAGES.index(stage)
+        self.seconds[self.runs, column] += (end - start) / len(self.runs)
+        self.calls[self.runs, column] += 1
+        return end
+
+    def get_state(self, results: list[Run | None]) -> dict:
+        return {
+            "iteration": self.iteration,
+            "runs": self.runs,
+            "words": self.words,
+            "phenotypes": self.phenotypes,
+            "generations": self.generations[:, : self.iteration + 1],
+            "grli": self.grli,
+            "rngs": [rng.bit_generator.state for rng in self.rngs],
+            "seconds": self.seconds,
+            "calls": self.calls,
+            "evaluations": self.evaluations,
+            "results": results,
+        }
+
+    def set_state(self, state: dict) -> list[Run | None]:
+        self.iteration = state["iteration"]
+        self.runs = state["runs"]
+        self.words = state["words"]
+        self.phenotypes = state["phenotypes"]
+        self.generations[:, : self.iteration + 1] = state["generations"]
+        self.grli = state["grli"]
+        for rng, rng_state in zip(self.rngs, state["rngs"]):
+            rng.bit_generator.state = rng_state
+        self.seconds = state["seconds"]
+        self.calls = state["calls"]
+        self.evaluations = state["evaluations"]
+        self.record_statistics()
+        return state["results"]
+
+    def get_parents(self, rngs: list[np.random.Generator]) -> np.ndarray:
+        if hasattr(self.selection_function, "get_parents_batch"):
+            return self.selection_function.get_parents_batch(self.phenotypes, rngs)
+        return np.stack(
+            [
+                self.selection_function.get_parents(PhenotypesView(phenotypes), rng)
+                for phenotypes, rng in zip(self.phenotypes, rngs)
+            ]
+        )
+
+    def evaluate(self, rows: np.ndarray):
+        if len(rows) == 0:
+            return
+        words = self.words.reshape(-1, self.words.shape[2])[rows]
+        if hasattr(self.fitness_function, "estimate_packed"):
+            fitness = self.fitness_function.estimate_packed(words, self.length)
+        else:
+            fitness = get_evaluator().evaluate(self.fitness_function, unpack(words, self.length))
+        self.phenotypes.reshape(-1)[rows] = fitness
+
+    def record_statistics(self):
+        self.avg_fitness = self.phenotypes.mean(axis=1)
+        self.std_fitness = self.phenotypes.std(axis=1)
+        self.optimal_counts = self.count_copies(self.optimal_words[None, :])
+        self.record("avg_fitness", self.avg_fitness)
+        self.record("std_fitness", self.std_fitness)
+        self.record("optimal_count", self.optimal_counts)
+
+    def record(self, column: str, values: np.ndarray):
+        self.generations[column][self.runs, self.iteration] = values
+
+    def get_best_genotypes(self) -> np.ndarray:
+        return self.words[np.arange(len(self.runs)), self.phenotypes.argmax(axis=1)]
+
+    def count_copies(self, words: np.ndarray) -> np.ndarray:
+        words = np.broadcast_to(words, (len(self.runs), self.words.shape[2]))
+        return np.count_nonzero((self.words == words[:, None, :]).all(axis=2), axis=1)
+
+    def count_unique(self) -> np.ndarray:
+        # Rows are sorted by a 64 bit hash of their words, which is the genotype itself for chains
+        # up to 64 bits. Longer chains fall back to an exact sort if two different genotypes collide.
+        runs, n, width = self.words.shape
+        hashes = self.words[..., 0]
+        for column in range(1, width):
+            hashes = hashes * HASH_MULTIPLIER + self.words[..., column]
+        slots = np.arange(runs)[:, None]
+        order = np.argsort(hashes, axis=1)
+        hashes = hashes[slots, order]
+        starts = hashes[:, 1:] != hashes[:, :-1]
+        if width > 1:
+            words = self.words[slots, order]
+            if ((words[:, 1:] != words[:, :-1]).any(axis=2) & ~starts).any():
+                return self.count_unique_exactly()
+        return 1 + np.count_nonzero(starts, axis=1)
+
+    def count_unique_exactly(self) -> np.ndarray:
+        runs, n, width = self.words.shape
+        words = self.words.reshape(runs * n, width)
+        owners = np.repeat(np.arange(runs), n)
+        order = np.lexsort(tuple(words[:, column] for column in range(words.shape[1])) + (owners,))
+        words = words[order]
+        owners = owners[order]
+        starts = np.ones((runs * n,), dtype=bool)
+        starts[1:] = (words[1:] != words[:-1]).any(axis=1) | (owners[1:] != owners[:-1])
+        return np.bincount(owners[starts], minlength=runs)
+
+    def estimate_convergence(self, percentage: int = 99) -> np.ndarray:
+        unique = self.count_unique()
+        if not self.p_m:
+            return unique == 1
+        return (unique / self.phenotypes.shape[1]) * 100 <= 100 - percentage
+
+    def keep(self, slots: np.ndarray):
+        self.phenotypes = self.phenotypes[slots]
+        self.avg_fitness = self.avg_fitness[slots]
+        self.std_fitness = self.std_fitness[slots]
+        self.optimal_counts = self.optimal_counts[slots]
+        self.words = self.words[slots]
+        self.runs = self.runs[slots]
+
+    def finish(self, slot: int, convergent: bool, ff_name: str) -> Run:
+        start = time.perf_counter()
+        run = self.runs[slot]
+        generations = self.generations[run, : self.iteration + 1].copy()
+        pressure_stats = PressureStats()
+        reproduction_stats = ReproductionStats()
+        selection_diff_stats = SelectionDiffStats()
+        if convergent:
+            pressure_stats.NI = self.iteration
+        if self.grli[run]:
+            pressure_stats.grli = int(self.grli[run])
+            pressure_stats.grl = generations["gr"][pressure_stats.grli].item()
+
+        pressure_stats.takeover_time = self.iteration
+        pressure_stats.f_found = self.phenotypes[slot].max()
+        pressure_stats.f_avg = self.avg_fitness[slot]
+        pressure_stats.calculate(generations)
+        reproduction_stats.calculate(generations)
+        selection_diff_stats.calculate(generations)
+        is_successful = self.check_success(slot, ff_name) if convergent else False
+
+        ns = NoiseStats() if ff_name.startswith("FConst") else None
+        if is_successful and ns:
+            ns.NI = self.iteration
+            ns.conv_to = int(unpack(self.words[slot, 0], self.length)[0])
+
+        stats = STAGES.index("stats")
+        self.seconds[run, stats] += time.perf_counter() - start
+        self.calls[run, stats] += 1
+        timings = StageTimings(
+            dict(zip(STAGES, self.seconds[run].tolist())),
+            dict(zip(STAGES, self.calls[run].tolist())),
+            int(self.evaluations[run]),
+        )
+
+        return Run(
+            generations,
+            pressure_stats,
+            reproduction_stats,
+            selection_diff_stats,
+            ns,
+            is_successful,
+            timings,
+        )
+
+    def check_success(self, slot: int, ff_name: str) -> bool:
+        if ff_name.startswith("FHD"):
+            optimal_chromosomes = self.optimal_counts[slot]
+            if self.p_m:
+                return bool(optimal_chromosomes >= .9 * N)
+            else:
+                return bool(optimal_chromosomes == N)
+        elif ff_name.startswith("FConst"):
+            return True
+        else:
+            success_chromosomes = self.fitness_function.check_success_batch(unpack(self.words[slot], self.length))
+            return bool(success_chromosomes.any())
@@ -0,0 +1,64 @@
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from cached_fitness import CachedFitness
+from constants import EVALUATOR, EVALUATOR_WORKERS, EVALUATOR_CHUNK_SIZE
+
+
+def estimate_chunk(fitness_function, chromosome_codes):
+    return fitness_function.estimate_batch(chromosome_codes)
+
+
+class SerialEvaluator:
+    def evaluate(self, fitness_function, chromosome_codes) -> np.ndarray:
+        return fitness_function.estimate_batch(chromosome_codes)
+
+    def __repr__(self):
+        return "SerialEvaluator"
+
+
+class PoolEvaluator:
+    def __init__(self, workers: int, chunk_size: int, processes: bool = False):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.processes = processes
+        self.executor = None
+
+    def evaluate(self, fitness_function, chromosome_codes) -> np.ndarray:
+        if isinstance(fitness_function, CachedFitness):
+            # The cache isn't shared with the workers: it is looked up and filled here, only the
+            # misses are sent out.
+            return fitness_function.estimate_batch(chromosome_codes, self.evaluate)
+        if len(chromosome_codes) <= self.chunk_size:
+            return fitness_function.estimate_batch(chromosome_codes)
+        if self.executor is None:
+            executor_type = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+            self.executor = executor_type(max_workers=self.workers)
+        chunks = [
+            chromosome_codes[start : start + self.chunk_size]
+            for start in range(0, len(chromosome_codes), self.chunk_size)
+        ]
+        results = self.executor.map(estimate_chunk, [fitness_function] * len(chunks), chunks)
+        return np.concatenate(list(results))
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __repr__(self):
+        kind = "Process" if self.processes else "Thread"
+        return f"{kind}PoolEvaluator[workers={self.workers}, chunk={self.chunk_size}]"
+
+
+evaluator = None
+
+
+def get_evaluator():
+    global evaluator
+    if evaluator is None:
+        if EVALUATOR == "serial":
+            evaluator = SerialEvaluator()
+        else:
+            evaluator = PoolEvaluator(EVALUATOR_WORKERS, EVALUATOR_CHUNK_SIZE, EVALUATOR == "process")
+    return evaluator
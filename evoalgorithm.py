@@ -1,8 +1,14 @@
+import time
+
+import numpy as np
+
 from pressure_stats import PressureStats
 from selection_diff_stats import SelectionDiffStats
 from reproduction_stats import ReproductionStats
 from noise_stats import NoiseStats
-from run import Run
+from run import Run, GENERATION_DTYPE
+from checkpoint import save_checkpoint, load_checkpoint
+from timing import StageTimings
 from population import Population
 from functions import *
 from constants import *
@@ -17,6 +23,9 @@ class EvoAlgorithm:
         optimal,
         p_m: float | None,
         p_c: float | None,
+        rng: np.random.Generator | None = None,
+        checkpoint: str | None = None,
+        track_lineage: bool = False,
     ):
         self.population: Population = initial_population
         self.selection_function = selection_function
@@ -25,27 +34,47 @@ class EvoAlgorithm:
         self.reproduction_stats = ReproductionStats()
         self.selection_diff_stats = SelectionDiffStats()
         self.best = self.population.get_best_genotype()
-        self.optimal_chromosome = fitness_function.generate_optimal(len(initial_population.genotypes_list[0]))
-        self.pressure_stats.num_of_best.append(
-            self.population.genotypes_list.count(self.best)
-        )
-        self.pressure_stats.f_best.append(self.population.get_max_fitness())
+        self.optimal_chromosome = fitness_function.generate_optimal(initial_population.length)
+        self.generations = np.zeros((G + 1,), dtype=GENERATION_DTYPE)
+        self.generations[0]["num_of_best"] = self.population.get_chromosomes_copies_count(self.best)
+        self.generations[0]["f_best"] = self.population.get_max_fitness()
         self.fitness_function = fitness_function
         self.optimal = optimal
         self.p_m = p_m
         self.p_c = p_c
+        # Parent rows of every generation, only kept on request: they grow with G and go into every checkpoint.
+        self.lineage = [] if track_lineage else None
+        self.rng = np.random.default_rng() if rng is None else rng
+        # File the state of the run is saved to every CHECKPOINT_INTERVAL generations and resumed from.
+        self.checkpoint = checkpoint
+        self.timings = StageTimings()
 
     def run(self, run, folder_name):
-        self.iteration = 0
-        avg_fitness_list = [self.population.get_mean_fitness()]
-        std_fitness_list = [self.population.get_fitness_std()]
-        optimal_count = [self.population.get_chromosomes_copies_count(self.optimal_chromosome)]
+        timings = self.timings
+        state = load_checkpoint(self.checkpoint) if self.checkpoint else None
+        if state is None:
+            self.iteration = 0
+            start = time.perf_counter()
+            first = self.generations[0]
+            first["avg_fitness"] = self.population.get_mean_fitness()
+            first["std_fitness"] = self.population.get_fitness_std()
+            first["optimal_count"] = self.population.get_chromosomes_copies_count(self.optimal_chromosome)
+            start = timings.record("stats", start)
+            convergent = self.population.estimate_convergence(self.p_m)
+            timings.record("convergence", start)
+        else:
+            self.set_state(state)
+            # The restored timings replace the fresh ones, so the run keeps counting on them.
+            timings = self.timings
+            convergent = False
+        current = self.generations[self.iteration]
+        f, f_std, f_best, num_of_best = current["avg_fitness"], current["std_fitness"], current["f_best"], current["num_of_best"]
         stop = G
-        convergent = self.population.estimate_convergence(self.p_m)
 
         ff_name = repr(self.fitness_function)
 
         while not convergent and self.iteration < stop:
+            start = time.perf_counter()
             if run < ITERATIONS_TO_REPORT and self.iteration < ITERATIONS_TO_REPORT:
                 sf_name = repr(self.selection_function)
                 self.population.print_ones_distribution(
@@ -71,53 +100,59 @@ class EvoAlgorithm:
                         self.iteration + 1,
                         self.fitness_function,
                     )
+                start = timings.record("plots", start)
 
-            best_chromosomes = self.population.get_best_chromosomes()
-            f = avg_fitness_list[self.iteration]
-            self.population = self.selection_function.select(self.population)
-            keys_after_selection = self.population.get_keys_list()
-            selected_chromosome_keys = set(keys_after_selection)
+            # Selection takes in the statistics of the parents pool it is measured by.
+            best_genotypes = self.population.get_best_genotypes()
+            self.population = self.selection_function.select(self.population, self.rng)
+            reproduction_rate = self.population.get_reproduction_rate()
             f_parents_pool = self.population.get_mean_fitness()
-            self.population.crossover(self.fitness_function, self.p_c)
-            self.population.mutate(self.fitness_function, self.p_m)
+            start = timings.record("selection", start)
+            self.population.crossover(self.fitness_function, self.p_c, self.rng, evaluate=False)
+            start = timings.record("crossover", start)
+            self.population.mutate(self.fitness_function, self.p_m, self.rng, evaluate=False)
+            start = timings.record("mutation", start)
+            timings.evaluations += int(np.count_nonzero(self.population.changed))
+            self.population.evaluate(self.fitness_function)
+            start = timings.record("evaluation", start)
+            intensity = PressureStats.calculate_intensity(f_parents_pool, f, f_std)
+            s = f_parents_pool - f
+            f = self.population.get_mean_fitness()
             f_std = self.population.get_fitness_std()
-            std_fitness_list.append(f_std)
-            fs = self.population.get_mean_fitness()
-            avg_fitness_list.append(fs)
-            optimal_count.append(self.population.get_chromosomes_copies_count(self.optimal_chromosome))
-            self.selection_diff_stats.s_list.append(f_parents_pool - f)
-            num_of_best = self.population.get_chromosomes_copies_count(best_chromosomes)
-            self.reproduction_stats.rr_list.append(
-                len(selected_chromosome_keys) / N
-            )
-            self.reproduction_stats.best_rr_list.append(
-                num_of_best / len(self.population.chromosomes)
-            )
-            self.pressure_stats.intensities.append(
-                PressureStats.calculate_intensity(
-                    f_parents_pool, f, std_fitness_list[self.iteration]
-                )
-            )
-            self.pressure_stats.f_best.append(self.population.get_max_fitness())
-            self.pressure_stats.num_of_best.append(num_of_best)
+            previous_num_of_best, previous_f_best = num_of_best, f_best
+            num_of_best = self.population.get_chromosomes_copies_count(best_genotypes)
+            f_best = self.population.get_max_fitness()
+            gr = PressureStats.calculate_growth_rate(num_of_best, previous_num_of_best, f_best, previous_f_best)
             self.iteration += 1
-            self.pressure_stats.grs.append(
-                PressureStats.calculate_growth_rate(
-                    self.pressure_stats.num_of_best[self.iteration],
-                    self.pressure_stats.num_of_best[self.iteration - 1],
-                    self.pressure_stats.f_best[self.iteration],
-                    self.pressure_stats.f_best[self.iteration - 1],
-                )
+            # Whole row at once, in GENERATION_DTYPE order: field by field writes cost several times more.
+            self.generations[self.iteration] = (
+                f,
+                f_std,
+                f_best,
+                s,
+                intensity,
+                gr,
+                reproduction_rate,
+                num_of_best / len(self.population),
+                self.population.get_chromosomes_copies_count(self.optimal_chromosome),
+                num_of_best,
             )
             if num_of_best >= N / 2 and self.pressure_stats.grl is None:
                 self.pressure_stats.grli = self.iteration
-                self.pressure_stats.grl = self.pressure_stats.grs[-1]
+                self.pressure_stats.grl = float(gr)
+            start = timings.record("stats", start)
             convergent = self.population.estimate_convergence(self.p_m)
+            timings.record("convergence", start)
             self.population.override_chromosome_keys()
+            if self.lineage is not None:
+                self.lineage.append(self.population.parents)
+            if self.checkpoint and CHECKPOINT_INTERVAL and self.iteration % CHECKPOINT_INTERVAL == 0 and not convergent:
+                save_checkpoint(self.checkpoint, self.get_state())
 
         if convergent:
             self.pressure_stats.NI = self.iteration
 
+        start = time.perf_counter()
         if run < ITERATIONS_TO_REPORT:
             sf_name = repr(self.selection_function)
             self.population.print_ones_distribution(
@@ -146,31 +181,68 @@ class EvoAlgorithm:
                     self.fitness_function,
                     is_last_iteration=True
                 )
+            start = timings.record("plots", start)
 
         self.pressure_stats.takeover_time = self.iteration
         self.pressure_stats.f_found = self.population.get_max_fitness()
         self.pressure_stats.f_avg = self.population.get_mean_fitness()
-        self.pressure_stats.calculate()
-        self.reproduction_stats.calculate()
-        self.selection_diff_stats.calculate()
+        generations = self.generations[: self.iteration + 1].copy()
+        self.pressure_stats.calculate(generations)
+        self.reproduction_stats.calculate(generations)
+        self.selection_diff_stats.calculate(generations)
         is_successful = self.check_success() if convergent else False
 
         ns = NoiseStats() if ff_name.startswith("FConst") else None
         if is_successful and ns:
             ns.NI = self.iteration
-            ns.conv_to = self.population.chromosomes[0].code[0]
+            ns.conv_to = int(self.population.get_genotype(0)[0])
+        timings.record("stats", start)
 
         return Run(
-            avg_fitness_list,
-            std_fitness_list,
-            optimal_count,
+            generations,
             self.pressure_stats,
             self.reproduction_stats,
             self.selection_diff_stats,
             ns,
             is_successful,
+            timings,
         )
 
+    def get_state(self) -> dict:
+        return {
+            "iteration": self.iteration,
+            "generations": self.generations[: self.iteration + 1],
+            "grl": self.pressure_stats.grl,
+            "grli": self.pressure_stats.grli,
+            "genotypes": self.population.genotypes,
+            "phenotypes": self.population.phenotypes,
+            "parents": self.population.parents,
+            "lineage": self.lineage,
+            "rng": self.rng.bit_generator.state,
+            "timings": self.timings,
+        }
+
+    def set_state(self, state: dict):
+        self.iteration = state["iteration"]
+        self.generations[: self.iteration + 1] = state["generations"]
+        self.pressure_stats.grl = state["grl"]
+        self.pressure_stats.grli = state["grli"]
+        self.population = Population(
+            state["genotypes"], state["phenotypes"], length=self.population.length if self.population.packed else None
+        )
+        self.population.parents = state["parents"]
+        self.lineage = state["lineage"]
+        self.rng.bit_generator.state = state["rng"]
+        self.timings = state["timings"]
+
+    def trace_lineage(self, index: int) -> list[int]:
+        if self.lineage is None:
+            raise ValueError("Lineage is only kept by runs created with track_lineage=True")
+        ancestors = [index]
+        for parents in reversed(self.lineage):
+            ancestors.append(int(parents[ancestors[-1]]))
+        return ancestors[::-1]
+
     def check_success(self):
         ff_name = repr(self.fitness_function)
         if ff_name.startswith("FHD"):
@@ -182,8 +254,5 @@ class EvoAlgorithm:
         elif ff_name.startswith("FConst"):
             return True
         else:
-            success_chromosomes = [
-                self.fitness_function.check_chromosome_success(p)
-                for p in self.population.chromosomes
-            ]
-            return any(success_chromosomes)
+            success_chromosomes = self.fitness_function.check_success_batch(self.population.get_genotypes())
+            return bool(success_chromosomes.any())
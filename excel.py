@@ -86,11 +86,15 @@ def save_to_excel(runs_dictionary, file_name, has_noise_stats):
     if has_noise_stats:
         save_noise_to_excel(runs_dictionary, worksheet, merge_format)
 
+    save_timings_to_excel(runs_dictionary, workbook)
+
     workbook.close()
 
 
 def save_noise_to_excel(runs_dictionary, worksheet, merge_format):
-    func_num = 12
+    # The noise block starts two rows below the main one, which takes a row per selection method.
+    first_func_num = len(runs_dictionary) + 4
+    func_num = first_func_num
 
     for func_name, runs_stats in runs_dictionary.items():
         worksheet.write(func_num + 1, 0, func_name)
@@ -104,12 +108,17 @@ def save_noise_to_excel(runs_dictionary, worksheet, merge_format):
                 run.noise_stats.as_dict(),
                 last_col_num,
                 func_num + 1,
-                func_num == 12,
+                func_num == first_func_num,
             )
             i = i + 1
-            if func_num == 12:
+            if func_num == first_func_num:
                 worksheet.merge_range(
-                    11, start_range, 11, last_col_num - 1, "Run " + str(i), merge_format
+                    first_func_num - 1,
+                    start_range,
+                    first_func_num - 1,
+                    last_col_num - 1,
+                    "Run " + str(i),
+                    merge_format,
                 )
 
         start_range = last_col_num
@@ -118,16 +127,34 @@ def save_noise_to_excel(runs_dictionary, worksheet, merge_format):
             runs_stats.as_noise_dict(),
             last_col_num,
             func_num + 1,
-            func_num == 12,
+            func_num == first_func_num,
         )
-        if func_num == 12:
+        if func_num == first_func_num:
             worksheet.merge_range(
-                11, start_range, 11, last_col_num - 1, "Avg values", merge_format
+                first_func_num - 1,
+                start_range,
+                first_func_num - 1,
+                last_col_num - 1,
+                "Avg values",
+                merge_format,
             )
 
         func_num = func_num + 1
 
 
+def save_timings_to_excel(runs_dictionary, workbook):
+    worksheet = workbook.add_worksheet()
+    worksheet.name = "timings"
+    func_num = 1
+
+    for func_name, runs_stats in runs_dictionary.items():
+        worksheet.write(func_num + 1, 0, func_name)
+        save_to_excel_internal(
+            worksheet, runs_stats.as_timings_dict(), 1, func_num + 1, func_num == 1
+        )
+        func_num = func_num + 1
+
+
 def save_avg_to_excel(func_runs_list):
     path = f"Report/{N}"
     if not os.path.exists(path):
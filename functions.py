@@ -3,6 +3,8 @@ import numpy as np
 from chromosome import Chromosome
 from constants import DELTA, SIGMA
 from population_factory import PopulationFactory
+from packing import popcount
+from lookup_table import load_lookup_table
 from coding import *
 
 
@@ -19,10 +21,24 @@ class FHD:
         k = np.count_nonzero(chromosome_code)
         return k
 
+    def get_packed_genotype_value(self, chromosome_words):
+        return int(popcount(chromosome_words))
+
     def estimate(self, chromosome_code):
-        l = len(chromosome_code)
-        k = l - np.count_nonzero(chromosome_code)
-        return (l - k) + k * self.delta
+        return self.estimate_batch(np.asarray(chromosome_code)[None, :])[0]
+
+    def estimate_batch(self, chromosome_codes):
+        return self.estimate_ones(np.count_nonzero(chromosome_codes, axis=1), chromosome_codes.shape[1])
+
+    def estimate_packed(self, chromosome_words, length):
+        return self.estimate_ones(popcount(chromosome_words), length)
+
+    def estimate_ones(self, ones, length):
+        k = length - ones
+        return (length - k) + k * self.delta
+
+    def check_success_batch(self, chromosome_codes):
+        return np.count_nonzero(chromosome_codes, axis=1) == 0
 
     def generate_optimal(self, length):
         coding = np.zeros((length, ), dtype=int)
@@ -31,8 +47,8 @@ class FHD:
     def get_optimal(self, n, l):
         return self.generate_optimal(l)
 
-    def generate_population(self, n, l):
-        return self.factory.generate(n, l)
+    def generate_population(self, n, l, rng=None):
+        return self.factory.generate(n, l, rng)
 
     def __repr__(self):
         return "FHD"
@@ -50,17 +66,32 @@ class FConst:
         k = np.count_nonzero(chromosome_code)
         return k
 
+    def get_packed_genotype_value(self, chromosome_words):
+        return int(popcount(chromosome_words))
+
     def score(self, x: float):
         return 100
 
     def estimate(self, chromosome_code):
-        return len(chromosome_code)
+        return self.estimate_batch(np.asarray(chromosome_code)[None, :])[0]
+
+    def estimate_batch(self, chromosome_codes):
+        return self.estimate_ones(np.count_nonzero(chromosome_codes, axis=1), chromosome_codes.shape[1])
+
+    def estimate_packed(self, chromosome_words, length):
+        return self.estimate_ones(popcount(chromosome_words), length)
+
+    def estimate_ones(self, ones, length):
+        return np.full(np.shape(ones), length, dtype=np.float64)
+
+    def check_success_batch(self, chromosome_codes):
+        return np.ones((len(chromosome_codes),), dtype=bool)
 
     def generate_optimal(self, length: int):
         return Chromosome(np.zeros((length,), dtype=int), length)
 
-    def generate_population(self, n, l):
-        return self.factory.generate(n, l)
+    def generate_population(self, n, l, rng=None):
+        return self.factory.generate(n, l, rng)
 
     def get_optimal(self, n, l):
         return self.generate_optimal(l)
@@ -75,15 +106,24 @@ class Fx2:
         self.b = 10.23
         self.x = (self.a, self.b)
         self.y = (self.score(self.a), self.score(self.b))
+        self.optimals = {}
         self.factory = PopulationFactory(self)
 
     def score(self, x: float):
-        return math.pow(x, 2)
+        return np.power(x, 2.0)
+
+    def get_table(self, length):
+        return load_lookup_table(self, length, (self.a, self.b))
 
     def estimate(self, chromosome_code):
-        x = decode(chromosome_code, self.a, self.b, len(chromosome_code))
-        y = self.score(x)
-        return y
+        return self.estimate_batch(np.asarray(chromosome_code)[None, :])[0]
+
+    def estimate_batch(self, chromosome_codes):
+        table = self.get_table(chromosome_codes.shape[1])
+        if table is not None:
+            return table.fitness[table.index(chromosome_codes)]
+        x = decode_batch(chromosome_codes, self.a, self.b, chromosome_codes.shape[1])
+        return self.score(x)
 
     def get_genotype_value(self, chromosome_code):
         x = decode(chromosome_code, self.a, self.b, len(chromosome_code))
@@ -93,19 +133,30 @@ class Fx2:
         return self.generate_optimal(l)
 
     def generate_optimal(self, length):
-        x_max = self.x[1]
-        coding = encode(x_max, self.a, self.b, length)
-        return Chromosome(coding, self.estimate(coding))
+        if length not in self.optimals:
+            x_max = self.x[1]
+            coding = encode(x_max, self.a, self.b, length)
+            self.optimals[length] = Chromosome(coding, self.estimate(coding))
+        return self.optimals[length]
 
-    def generate_population(self, n, l):
-        return self.factory.generate(n, l)
+    def generate_population(self, n, l, rng=None):
+        return self.factory.generate(n, l, rng)
 
     def check_chromosome_success(self, chromosome: Chromosome):
-        x = decode(chromosome.code, self.a, self.b, len(chromosome.code))
+        return bool(self.check_success_batch(np.asarray(chromosome.code)[None, :])[0])
+
+    def check_success_batch(self, chromosome_codes):
+        table = self.get_table(chromosome_codes.shape[1])
+        if table is not None:
+            return table.success[table.index(chromosome_codes)]
+        x = decode_batch(chromosome_codes, self.a, self.b, chromosome_codes.shape[1])
+        return self.check_success_value(x)
+
+    def check_success_value(self, x):
         x_max = self.x[1]
         y = self.score(x)
         y_max = self.y[1]
-        return abs(y_max - y) <= DELTA and abs(x_max - x) <= SIGMA
+        return (np.abs(y_max - y) <= DELTA) & (np.abs(x_max - x) <= SIGMA)
 
     def __repr__(self):
         return "Fx2"
@@ -117,15 +168,24 @@ class F5122subx2:
         self.b = 5.11
         self.x = (self.a, 0)
         self.y = (self.score(self.a), self.score(0))
+        self.optimals = {}
         self.factory = PopulationFactory(self)
 
     def score(self, x: float):
-        return math.pow(5.12, 2) - math.pow(x, 2)
+        return math.pow(5.12, 2) - np.power(x, 2.0)
+
+    def get_table(self, length):
+        return load_lookup_table(self, length, (self.a, self.b))
 
     def estimate(self, chromosome_code):
-        x = decode(chromosome_code, self.a, self.b, len(chromosome_code))
-        y = self.score(x)
-        return y
+        return self.estimate_batch(np.asarray(chromosome_code)[None, :])[0]
+
+    def estimate_batch(self, chromosome_codes):
+        table = self.get_table(chromosome_codes.shape[1])
+        if table is not None:
+            return table.fitness[table.index(chromosome_codes)]
+        x = decode_batch(chromosome_codes, self.a, self.b, chromosome_codes.shape[1])
+        return self.score(x)
 
     def get_genotype_value(self, chromosome_code):
         x = decode(chromosome_code, self.a, self.b, len(chromosome_code))
@@ -135,19 +195,30 @@ class F5122subx2:
         return self.generate_optimal(l)
 
     def generate_optimal(self, length):
-        x_max = 0
-        coding = encode(x_max, self.a, self.b, length)
-        return Chromosome(coding, self.estimate(coding))
+        if length not in self.optimals:
+            x_max = 0
+            coding = encode(x_max, self.a, self.b, length)
+            self.optimals[length] = Chromosome(coding, self.estimate(coding))
+        return self.optimals[length]
 
-    def generate_population(self, n, l):
-        return self.factory.generate(n, l)
+    def generate_population(self, n, l, rng=None):
+        return self.factory.generate(n, l, rng)
 
     def check_chromosome_success(self, chromosome: Chromosome):
-        x = decode(chromosome.code, self.a, self.b, len(chromosome.code))
+        return bool(self.check_success_batch(np.asarray(chromosome.code)[None, :])[0])
+
+    def check_success_batch(self, chromosome_codes):
+        table = self.get_table(chromosome_codes.shape[1])
+        if table is not None:
+            return table.success[table.index(chromosome_codes)]
+        x = decode_batch(chromosome_codes, self.a, self.b, chromosome_codes.shape[1])
+        return self.check_success_value(x)
+
+    def check_success_value(self, x):
         x_max = self.x[1]
         y = self.score(x)
         y_max = self.y[1]
-        return abs(y_max - y) <= DELTA and abs(x_max - x) <= SIGMA
+        return (np.abs(y_max - y) <= DELTA) & (np.abs(x_max - x) <= SIGMA)
     
     def __repr__(self):
         return "F5122subx2"
@@ -158,15 +229,25 @@ class Fecx:
         self.a = 0
         self.b = 10.23
         self.x = (self.a, self.b)
-        self.y = (self.score(self.a), self.score(self.b))
         self.c = c
+        self.y = (self.score(self.a), self.score(self.b))
+        self.optimals = {}
         self.factory = PopulationFactory(self)
 
     def score(self, x: float):
-        return math.exp(self.c * x)
+        return np.exp(self.c * x)
+
+    def get_table(self, length):
+        return load_lookup_table(self, length, (self.a, self.b, self.c))
 
     def estimate(self, chromosome_code):
-        x = decode(chromosome_code, self.a, self.b, len(chromosome_code))
+        return self.estimate_batch(np.asarray(chromosome_code)[None, :])[0]
+
+    def estimate_batch(self, chromosome_codes):
+        table = self.get_table(chromosome_codes.shape[1])
+        if table is not None:
+            return table.fitness[table.index(chromosome_codes)]
+        x = decode_batch(chromosome_codes, self.a, self.b, chromosome_codes.shape[1])
         return self.score(x)
 
     def get_genotype_value(self, chromosome_code):
@@ -174,22 +255,33 @@ class Fecx:
         return x
 
     def generate_optimal(self, length):
-        x_max = self.x[1]
-        coding = encode(x_max, self.a, self.b, length)
-        return Chromosome(coding, self.estimate(coding))
+        if length not in self.optimals:
+            x_max = self.x[1]
+            coding = encode(x_max, self.a, self.b, length)
+            self.optimals[length] = Chromosome(coding, self.estimate(coding))
+        return self.optimals[length]
 
     def get_optimal(self, n, l):
         return self.generate_optimal(l)
 
-    def generate_population(self, n, l):
-        return self.factory.generate(n, l)
+    def generate_population(self, n, l, rng=None):
+        return self.factory.generate(n, l, rng)
 
     def check_chromosome_success(self, chromosome: Chromosome):
-        x = decode(chromosome.code, self.a, self.b, len(chromosome.code))
+        return bool(self.check_success_batch(np.asarray(chromosome.code)[None, :])[0])
+
+    def check_success_batch(self, chromosome_codes):
+        table = self.get_table(chromosome_codes.shape[1])
+        if table is not None:
+            return table.success[table.index(chromosome_codes)]
+        x = decode_batch(chromosome_codes, self.a, self.b, chromosome_codes.shape[1])
+        return self.check_success_value(x)
+
+    def check_success_value(self, x):
         x_max = self.x[1]
         y = self.score(x)
         y_max = self.y[1]
-        return abs(y_max - y) <= DELTA and abs(x_max - x) <= SIGMA
+        return (np.abs(y_max - y) <= DELTA) & (np.abs(x_max - x) <= SIGMA)
 
     def __repr__(self):
         return "Fecx"
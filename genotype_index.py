@@ -0,0 +1,17 @@
+import numpy as np
+
+from packing import genotype_keys
+
+
+class GenotypeIndex:
+    def __init__(self, genotypes: np.ndarray):
+        keys, counts = np.unique(genotype_keys(genotypes), return_counts=True)
+        self.total = len(genotypes)
+        self.counts = dict(zip(keys.tolist(), counts.tolist()))
+
+    def count(self, genotypes: np.ndarray) -> int:
+        samples = set(genotype_keys(genotypes).tolist())
+        return sum(self.counts.get(sample, 0) for sample in samples)
+
+    def __len__(self):
+        return len(self.counts)
@@ -0,0 +1,26 @@
+import numpy as np
+
+from population import Population
+from ranking import get_linear_rank_table, rank
+from sus import basic_sus, basic_sus_batch
+
+
+class LinearRankSUS:
+    def __init__(self, s: float):
+        self.s = s
+
+    def get_parents(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        N = len(population)
+        indices = rank(population.phenotypes, rng.permutation(N))
+        table = get_linear_rank_table(self.s, N)
+        return indices[basic_sus(population, table.total, table.scale, rng)]
+
+    def get_parents_batch(self, phenotypes: np.ndarray, rngs: list[np.random.Generator]) -> np.ndarray:
+        return basic_sus_batch(phenotypes, get_linear_rank_table(self.s, phenotypes.shape[1]), rngs)
+
+    def select(self, population: Population, rng: np.random.Generator):
+        population.update_indices(self.get_parents(population, rng))
+        return population
+
+    def __repr__(self):
+        return f"LinearRankSUS[s={self.s}]"
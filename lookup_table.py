@@ -0,0 +1,51 @@
+import os
+import numpy as np
+
+from constants import ENCODING, LOOKUP_TABLE_LIMIT
+from coding import decode_batch, decimal_to_binary_batch, binary_to_decimal_batch
+
+
+tables = {}
+
+
+class LookupTable:
+    def __init__(self, x: np.ndarray, fitness: np.ndarray, success: np.ndarray):
+        self.x = x
+        self.fitness = fitness
+        self.success = success
+
+    def index(self, chromosome_codes) -> np.ndarray:
+        return binary_to_decimal_batch(np.asarray(chromosome_codes, dtype=np.uint8))
+
+
+def build_lookup_table(fitness_function, length) -> LookupTable:
+    codes = decimal_to_binary_batch(np.arange(2**length), length)
+    x = decode_batch(codes, fitness_function.a, fitness_function.b, length)
+    return LookupTable(x, fitness_function.score(x), fitness_function.check_success_value(x))
+
+
+def load_lookup_table(fitness_function, length: int, parameters: tuple) -> LookupTable | None:
+    if length < 1 or 2**length > LOOKUP_TABLE_LIMIT:
+        return None
+
+    name = "_".join([repr(fitness_function), *map(str, parameters), str(length), ENCODING])
+    if name in tables:
+        return tables[name]
+
+    dir_path = "LookupTables"
+    file_path = f"{dir_path}/{name}.npz"
+    # Success depends on DELTA and SIGMA, so only x and fitness are kept on disk and success is
+    # worked out again on every load.
+    if os.path.exists(file_path):
+        with np.load(file_path) as data:
+            table = LookupTable(data["x"], data["fitness"], fitness_function.check_success_value(data["x"]))
+    else:
+        table = build_lookup_table(fitness_function, length)
+        if not os.path.exists(dir_path):
+            os.makedirs(dir_path, exist_ok=True)
+        temporary_path = f"{dir_path}/{name}.{os.getpid()}.npz"
+        np.savez(temporary_path, x=table.x, fitness=table.fitness)
+        os.replace(temporary_path, file_path)
+
+    tables[name] = table
+    return table
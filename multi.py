@@ -1,16 +1,24 @@
+import sys
 import time
 
 from tqdm import tqdm
 
 from multiprocessing import Pool
-from constants import ITERATIONS_TO_REPORT, MAX_RUNS, env
+from constants import ITERATIONS_TO_REPORT, MAX_RUNS, FITNESS_CACHE_SIZE, EVALUATOR, ENSEMBLE_SIZE, env
+from cached_fitness import CachedFitness
 from functions import *
+from benchmarks import Sphere, Rastrigin, Rosenbrock, Ackley, DeceptiveTrap, NKLandscape
 from rws import RankExponentialRWS
 from sus import RankExponentialSUS
+from tournament import TournamentSelection
+from truncation import TruncationSelection
+from linear_rank import LinearRankSUS
 from plots import *
-from program import main
+from program import main, main_ensemble
 from excel import save_avg_to_excel
 from runs_stats import RunsStats
+from seeding import get_run_seeds, get_generator, get_stream_index, save_seed_manifest
+from checkpoint import prepare_checkpoints, get_checkpoint_path, save_checkpoint, load_checkpoint, remove_checkpoint
 from excel import save_to_excel
 
 
@@ -29,6 +37,11 @@ selection_methods = [
     RankExponentialRWS(c=C2),
     RankExponentialRWS(c=C3),
     RankExponentialRWS(c=C4),
+
+    TournamentSelection(size=2),
+    TournamentSelection(size=4, replacement=False),
+    TruncationSelection(threshold=0.5),
+    LinearRankSUS(s=1.5),
 ]
 
 pm_b = 0.000005
@@ -80,6 +93,23 @@ test_fitness_configs = [
     (FHD(100), N, 100)
 ]
 
+benchmark_arguments = [
+    [("Sphere_pmpc", pm_x, pc)],
+    [("Rastrigin_pmpc", pm_x, pc)],
+    [("Rosenbrock_pmpc", pm_x, pc)],
+    [("Ackley_pmpc", pm_x, pc)],
+    [("Trap_pmpc", pm_b, pc)],
+    [("NK_pmpc", pm_b, pc)],
+]
+benchmark_fitness_configs = [
+    (Sphere(dimensions=20, bits=10), N, 200),
+    (Rastrigin(dimensions=20, bits=10), N, 200),
+    (Rosenbrock(dimensions=20, bits=12), N, 240),
+    (Ackley(dimensions=20, bits=16), N, 320),
+    (DeceptiveTrap(length=1000, k=5), N, 1000),
+    (NKLandscape(length=1000, k=4), N, 1000),
+]
+
 release_arguments = [
     fhd_arguments,
     fx2_arguments,
@@ -93,10 +123,12 @@ relase_fitness_configs = [
     fconst_fitness_config
 ]
 
-def run_functions(fitness_config, arguments):
+def run_functions(config_index, fitness_config, arguments):
     runs_stats = {}
 
     fitness_function, *population_arguments = fitness_config
+    if FITNESS_CACHE_SIZE:
+        fitness_function = CachedFitness(fitness_function, FITNESS_CACHE_SIZE)
 
     for argument in arguments:
         file_name, *_ = argument
@@ -105,20 +137,68 @@ def run_functions(fitness_config, arguments):
             sf_name = repr(selection_method)
             runs_stats[file_name][sf_name] = RunsStats()
 
-    for run in tqdm(range(MAX_RUNS)):
-        initial_population = fitness_function.generate_population(*population_arguments)
-        for argument in arguments:
+    # Reported runs go one by one to plot their distributions, the rest are advanced in ensembles.
+    batches = [[run] for run in range(min(ITERATIONS_TO_REPORT, MAX_RUNS))]
+    batch_size = max(ENSEMBLE_SIZE, 1)
+    batches += [list(range(run, min(run + batch_size, MAX_RUNS))) for run in range(len(batches), MAX_RUNS, batch_size)]
+
+    for batch in tqdm(batches):
+        seeds = [get_run_seeds(config_index, run, 1 + len(arguments) * len(selection_methods)) for run in batch]
+        initial_populations = [
+            fitness_function.generate_population(*population_arguments, rng=get_generator(run_seeds[0]))
+            for run_seeds in seeds
+        ]
+        for argument_index, argument in enumerate(arguments):
             file_name, *rest_argument = argument
 
-            for selection_method in selection_methods:
+            for selection_index, selection_method in enumerate(selection_methods):
                 sf_name = repr(selection_method)
-
-                run_stats = main(run, fitness_function, initial_population, selection_method, file_name, *rest_argument)
-                runs_stats[file_name][sf_name].runs.append(run_stats)
-
-                if run < ITERATIONS_TO_REPORT:
-                    print(f"{file_name} for {sf_name} per {run} run: saving plots...")
-                    save_run_plots(file_name, sf_name, run_stats, run)
+                # Batches finished by an earlier attempt of the sweep are read back, unfinished ones
+                # continue from their last snapshot.
+                checkpoint_path = get_checkpoint_path(config_index, file_name, sf_name, batch)
+                batch_stats = load_checkpoint(f"{checkpoint_path}.runs")
+                if batch_stats is not None:
+                    runs_stats[file_name][sf_name].runs.extend(batch_stats)
+                    remove_checkpoint(f"{checkpoint_path}.state")
+                    continue
+
+                stream = get_stream_index(argument_index, selection_index, len(selection_methods))
+                rngs = [get_generator(run_seeds[stream]) for run_seeds in seeds]
+
+                if len(batch) == 1:
+                    batch_stats = [
+                        main(
+                            batch[0],
+                            fitness_function,
+                            initial_populations[0],
+                            selection_method,
+                            file_name,
+                            *rest_argument,
+                            rng=rngs[0],
+                            checkpoint=f"{checkpoint_path}.state",
+                        )
+                    ]
+                else:
+                    batch_stats = main_ensemble(
+                        batch,
+                        fitness_function,
+                        initial_populations,
+                        selection_method,
+                        file_name,
+                        *rest_argument,
+                        rngs=rngs,
+                        checkpoint=f"{checkpoint_path}.state",
+                    )
+                runs_stats[file_name][sf_name].runs.extend(batch_stats)
+
+                for run, run_stats in zip(batch, batch_stats):
+                    if run < ITERATIONS_TO_REPORT:
+                        print(f"{file_name} for {sf_name} per {run} run: saving plots...")
+                        start = time.perf_counter()
+                        save_run_plots(file_name, sf_name, run_stats, run)
+                        run_stats.timings.record("plots", start)
+                save_checkpoint(f"{checkpoint_path}.runs", batch_stats)
+                remove_checkpoint(f"{checkpoint_path}.state")
 
     for argument in arguments:
         file_name, *_ = argument
@@ -132,19 +212,37 @@ def run_functions(fitness_config, arguments):
         print(f"{file_name}: saving reports...")
         save_to_excel(sf_run_dictionary, file_name, has_noise_stats)
 
+    if FITNESS_CACHE_SIZE:
+        print(f"{repr(fitness_function)}: fitness cache {fitness_function}")
+
     return runs_stats
 
 
 if __name__ == "__main__":
     p_start = time.time()
 
-    fitness_configs = test_fitness_configs if env == "test" else relase_fitness_configs 
-    arguments = test_arguments if env == "test" else release_arguments
-    properties = [(fitness_config, argument) for fitness_config, argument in zip(fitness_configs, arguments)]
-
-    with Pool(6) as pool:
-        runs_list = pool.starmap(run_functions, properties)
+    if env == "test":
+        fitness_configs, arguments = test_fitness_configs, test_arguments
+    elif env == "benchmark":
+        fitness_configs, arguments = benchmark_fitness_configs, benchmark_arguments
+    else:
+        fitness_configs, arguments = relase_fitness_configs, release_arguments
+    properties = [
+        (config_index, fitness_config, argument)
+        for config_index, (fitness_config, argument) in enumerate(zip(fitness_configs, arguments))
+    ]
+    save_seed_manifest(arguments, selection_methods, MAX_RUNS)
+    # python multi.py --resume picks a crashed or interrupted sweep up from its checkpoints.
+    prepare_checkpoints("--resume" in sys.argv[1:], fitness_configs, arguments, selection_methods)
+
+    if EVALUATOR == "process":
+        # Pool workers are daemonic and can't start the evaluator's own worker processes.
+        runs_list = [run_functions(*property) for property in properties]
         save_avg_to_excel(runs_list)
+    else:
+        with Pool(6) as pool:
+            runs_list = pool.starmap(run_functions, properties)
+            save_avg_to_excel(runs_list)
 
     p_end = time.time()
     print("Program calculation (in sec.): " + str((p_end - p_start)))
@@ -0,0 +1,17 @@
+import math
+import numpy as np
+
+
+def mutation_positions(size: int, p_m: float, rng: np.random.Generator) -> np.ndarray:
+    # Gaps between successes of size Bernoulli(p_m) trials are geometric,
+    # so flipped positions are drawn directly instead of one draw per bit.
+    if p_m >= 1:
+        return np.arange(size)
+    expected = size * p_m
+    chunk = int(expected + 6 * math.sqrt(expected)) + 16
+    positions = np.cumsum(rng.geometric(p_m, size=chunk)) - 1
+    while positions[-1] < size:
+        positions = np.concatenate(
+            [positions, positions[-1] + np.cumsum(rng.geometric(p_m, size=chunk))]
+        )
+    return positions[positions < size]
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+WORD_BITS = 64
+
+_POPCOUNT_TABLE = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def words_count(length: int) -> int:
+    return -(-length // WORD_BITS)
+
+
+def pack(genotypes) -> np.ndarray:
+    genotypes = np.asarray(genotypes, dtype=np.uint8)
+    length = genotypes.shape[-1]
+    packed = np.packbits(genotypes, axis=-1)
+    padded = np.zeros(genotypes.shape[:-1] + (words_count(length) * 8,), dtype=np.uint8)
+    padded[..., : packed.shape[-1]] = packed
+    return padded.view(np.uint64)
+
+
+def suffix_words(points, length: int) -> np.ndarray:
+    # Packed rows with the bits from every point up to the end of the chain set.
+    points = np.asarray(points)
+    columns = np.arange(words_count(length))
+    word = (points // WORD_BITS)[..., None]
+    words = np.where(columns > word, _FULL_WORD, np.uint64(0))
+    words = np.where(columns == word, _SUFFIX_WORDS[points % WORD_BITS][..., None], words)
+    return words & pack(np.ones((length,), dtype=np.uint8))
+
+
+def unpack(words, length: int) -> np.ndarray:
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    return np.unpackbits(words.view(np.uint8), axis=-1, count=length)
+
+
+def popcount(words) -> np.ndarray:
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def genotype_keys(genotypes) -> np.ndarray:
+    genotypes = np.ascontiguousarray(genotypes)
+    row_size = genotypes.shape[-1] * genotypes.itemsize
+    return genotypes.view(np.dtype((np.void, row_size)))[..., 0]
+
+
+def get_bits(words, rows, columns) -> np.ndarray:
+    shifts = (7 - (columns & 7)).astype(np.uint8)
+    return (words.view(np.uint8)[rows, columns >> 3] >> shifts) & 1
+
+
+def flip_bits(words, rows, columns):
+    shifts = (7 - (columns & 7)).astype(np.uint8)
+    np.bitwise_xor.at(words.view(np.uint8), (rows, columns >> 3), np.left_shift(1, shifts, dtype=np.uint8))
+
+
+_FULL_WORD = np.uint64(2**WORD_BITS - 1)
+_SUFFIX_WORDS = pack(np.arange(WORD_BITS) >= np.arange(WORD_BITS)[:, None])[:, 0]
@@ -59,7 +59,7 @@ def save_run_plots(ff_name, sf_name, run, iteration):
     save_line_plot(
         ff_name,
         sf_name,
-        run.pressure_stats.f_best,
+        run.f_best,
         "f_best" + str(iteration + 1),
         "f best",
         iteration + 1,
@@ -83,7 +83,7 @@ def save_run_plots(ff_name, sf_name, run, iteration):
     save_line_plot(
         ff_name,
         sf_name,
-        run.pressure_stats.intensities,
+        run.intensities,
         "intensity" + str(iteration + 1),
         "Intensity",
         iteration + 1,
@@ -91,7 +91,7 @@ def save_run_plots(ff_name, sf_name, run, iteration):
     save_line_plot(
         ff_name,
         sf_name,
-        run.selection_diff_stats.s_list,
+        run.s_list,
         "selection_diff" + str(iteration + 1),
         "Selection difference",
         iteration + 1,
@@ -99,7 +99,7 @@ def save_run_plots(ff_name, sf_name, run, iteration):
     save_lines_plot(
         ff_name,
         sf_name,
-        [run.pressure_stats.intensities, run.selection_diff_stats.s_list],
+        [run.intensities, run.s_list],
         ["Intensity", "EvoAlgorithm diff"],
         "intensity_and_sel_diff" + str(iteration + 1),
         "Intensity + EvoAlgorithm diff",
@@ -108,7 +108,7 @@ def save_run_plots(ff_name, sf_name, run, iteration):
     save_line_plot(
         ff_name,
         sf_name,
-        run.pressure_stats.grs,
+        run.grs,
         "gr" + str(iteration + 1),
         "Growth rate",
         iteration + 1,
@@ -117,8 +117,8 @@ def save_run_plots(ff_name, sf_name, run, iteration):
         ff_name,
         sf_name,
         [
-            run.reproduction_stats.rr_list,
-            [1 - rr for rr in run.reproduction_stats.rr_list],
+            run.rr_list,
+            1 - run.rr_list,
         ],
         ["Reproduction rate", "Loss of diversity"],
         "repro_rate_and_loss_of_diversity" + str(iteration + 1),
@@ -128,7 +128,7 @@ def save_run_plots(ff_name, sf_name, run, iteration):
     save_line_plot(
         ff_name,
         sf_name,
-        run.reproduction_stats.best_rr_list,
+        run.best_rr_list,
         "best_rr" + str(iteration + 1),
         "Best chromosome rate",
         iteration + 1,
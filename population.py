@@ -1,23 +1,122 @@
 import os
 
-import random
 import numpy as np
 import matplotlib.pyplot as plt
 
 from chromosome import Chromosome
 from constants import N, ENCODING
+from packing import pack, unpack, popcount, get_bits, flip_bits
+from crossover import crossover_masks
+from mutation import mutation_positions
+from genotype_index import GenotypeIndex
+from evaluator import get_evaluator
+
+
+def read_only(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def writable(array: np.ndarray) -> np.ndarray:
+    return array if array.flags.writeable else array.copy()
 
 
 class Population:
-    def __init__(self, chromosomes: list[Chromosome]):
-        self.chromosomes = chromosomes
-        self.phenotypes_list = np.fromiter(
-            map(lambda chromosome: chromosome.fitness, self.chromosomes),
-            dtype=np.float64,
-        )
-        self.genotypes_list = list(
-            map(lambda chromosome: list(chromosome.code), self.chromosomes)
-        )
+    def __init__(
+        self,
+        genotypes: np.ndarray,
+        phenotypes: np.ndarray,
+        keys: np.ndarray | None = None,
+        length: int | None = None,
+    ):
+        # Packed populations keep every genotype as a row of uint64 words and
+        # remember the chain length, unpacked ones keep a row of uint8 bits.
+        self.packed = length is not None
+        self.genotypes = np.ascontiguousarray(genotypes, dtype=np.uint64 if self.packed else np.uint8)
+        self.length = length if self.packed else self.genotypes.shape[1]
+        self.phenotypes = np.ascontiguousarray(phenotypes, dtype=np.float64)
+        # Keys are the row of every individual's ancestor in the population the generation started
+        # from, parents are the keys the previous generation ended with.
+        self.keys = np.arange(len(self.phenotypes), dtype=np.int32) if keys is None else np.asarray(keys, dtype=np.int32)
+        self.parents = self.keys
+        # Individuals whose genotype was changed by variation and still carry a stale fitness.
+        self.changed = np.zeros(len(self.phenotypes), dtype=bool)
+        # Ones per genotype, kept up to date by variation for fitness functions with a delta rule.
+        self.ones = None
+        # Views derived from the arrays above, computed on first access until the population changes.
+        self.derived = {}
+
+    def pack(self) -> "Population":
+        if self.packed:
+            return self
+        return Population(pack(self.genotypes), self.phenotypes, self.keys, self.length)
+
+    @property
+    def chromosomes(self) -> list[Chromosome]:
+        return [
+            Chromosome(code, fitness, key)
+            for code, fitness, key in zip(self.get_genotypes(), self.phenotypes, self.keys)
+        ]
+
+    def get_genotypes(self) -> np.ndarray:
+        if not self.packed:
+            return self.genotypes
+        return self.get_derived("genotypes", lambda: unpack(self.genotypes, self.length))
+
+    def get_derived(self, name, calculate):
+        if name not in self.derived:
+            self.derived[name] = calculate()
+        return self.derived[name]
+
+    def invalidate(self):
+        self.derived = {}
+
+    def get_genotype(self, index) -> np.ndarray:
+        return unpack(self.genotypes[index], self.length) if self.packed else self.genotypes[index]
+
+    def get_ones_counts(self) -> np.ndarray:
+        return self.count_ones(self.genotypes)
+
+    def count_ones(self, genotypes) -> np.ndarray:
+        return popcount(genotypes) if self.packed else np.count_nonzero(genotypes, axis=1)
+
+    def track_ones(self, fitness_function):
+        if self.ones is None and hasattr(fitness_function, "estimate_ones"):
+            self.ones = self.get_ones_counts()
+
+    def flip(self, rows, columns) -> np.ndarray:
+        if len(rows) == 0:
+            return np.zeros((0,), dtype=np.uint8)
+        self.genotypes = writable(self.genotypes)
+        if self.packed:
+            bits = get_bits(self.genotypes, rows, columns)
+            flip_bits(self.genotypes, rows, columns)
+        else:
+            bits = self.genotypes[rows, columns]
+            self.genotypes[rows, columns] ^= 1
+        self.invalidate()
+        return bits
+
+    def get_genotype_values(self, fitness_function) -> list:
+        if self.packed and hasattr(fitness_function, "get_packed_genotype_value"):
+            return [fitness_function.get_packed_genotype_value(words) for words in self.genotypes]
+        return [fitness_function.get_genotype_value(code) for code in self.get_genotypes()]
+
+    def get_genotype_index(self) -> GenotypeIndex:
+        return self.get_derived("genotype_index", lambda: GenotypeIndex(self.genotypes))
+
+    def estimate(self, fitness_function, indices) -> np.ndarray:
+        if self.packed and hasattr(fitness_function, "estimate_packed"):
+            return fitness_function.estimate_packed(self.genotypes[indices], self.length)
+        return get_evaluator().evaluate(fitness_function, self.get_genotype(indices))
+
+    def to_storage(self, genotypes) -> np.ndarray:
+        genotypes = np.asarray(genotypes, dtype=np.uint8).reshape(-1, self.length)
+        return pack(genotypes) if self.packed else genotypes
+
+    def __len__(self):
+        return len(self.phenotypes)
 
     def print_ones_distribution(
         self, ff_name, selection_name, run, iteration, fitness_function, is_last_iteration=False
@@ -29,9 +128,9 @@ class Population:
         if not os.path.exists(dir_path):
             os.makedirs(dir_path)
 
-        length = len(self.genotypes_list[0])
- 
-        values = [genotype_list.count(1) for genotype_list in self.genotypes_list]
+        length = self.length
+
+        values = self.get_ones_counts()
         boxes = 10
         counts, bins = np.histogram(values, bins=boxes)
 
@@ -65,9 +164,9 @@ class Population:
         if not os.path.exists(dir_path):
             os.makedirs(dir_path)
 
-        length = len(self.genotypes_list[0])
+        length = self.length
 
-        values = self.phenotypes_list
+        values = self.phenotypes
         boxes = 20 if length == 10 else 10
         counts, bins = np.histogram(values, bins=boxes)
 
@@ -101,9 +200,9 @@ class Population:
         if not os.path.exists(dir_path):
             os.makedirs(dir_path)
 
-        length = len(self.genotypes_list[0])
+        length = self.length
 
-        values = [fitness_function.get_genotype_value(code) for code in self.genotypes_list]
+        values = self.get_genotype_values(fitness_function)
         boxes = 20 if length == 10 else 10
         counts, bins = np.histogram(values, bins=boxes)
 
@@ -136,156 +235,142 @@ class Population:
             "According to formula: (unique / total) * 100 <= 100 - percentage, "
             "we can't have percentage >= 100!"
         )
-        chromosomes = [self.bin2int(genotype) for genotype in self.genotypes_list]
-        total = len(chromosomes)
-        unique = len(set(chromosomes))
+        genotype_index = self.get_genotype_index()
+        total = genotype_index.total
+        unique = len(genotype_index)
         return (unique / total) * 100 <= 100 - percentage
 
     @property
     def is_identical(self) -> bool:
-        genotypes = {self.bin2int(genotype) for genotype in self.genotypes_list}
-        return len(genotypes) == 1
+        return len(self.get_genotype_index()) == 1
 
-    def crossover(self, fitness_function, p_c):
-        if p_c == 0:
+    def evaluate(self, fitness_function):
+        changed = np.flatnonzero(self.changed)
+        if len(changed) == 0:
             return
+        self.phenotypes = writable(self.phenotypes)
+        if self.ones is not None and hasattr(fitness_function, "estimate_ones"):
+            self.phenotypes[changed] = fitness_function.estimate_ones(self.ones[changed], self.length)
+        else:
+            self.phenotypes[changed] = self.estimate(fitness_function, changed)
+        self.changed[:] = False
+        self.invalidate()
 
-        next_chromosomes = []
-
-        chromosomes = self.chromosomes.copy()
-
-        def pop_chromosome():
-            index = random.randrange(0, len(chromosomes))
-            return chromosomes.pop(index)
-
-        next_key = 0
-
-        while len(chromosomes) > 0:
-            parent1 = pop_chromosome()
-            parent2 = pop_chromosome()
-
-            crossover_point = int(random.random() * len(parent1.code))
-
-            child_code1 = [
-                *parent1.code[:crossover_point],
-                *parent2.code[crossover_point:],
-            ]
-            child_chromosome1 = Chromosome(
-                child_code1, fitness_function.estimate(child_code1), next_key + 1
-            )
-
-            child_code2 = [
-                *parent2.code[:crossover_point],
-                *parent1.code[crossover_point:],
-            ]
-            child_chromosome2 = Chromosome(
-                child_code2, fitness_function.estimate(child_code2), next_key + 2
-            )
-
-            next_chromosomes.append(child_chromosome1)
-            next_chromosomes.append(child_chromosome2)
-
-            next_key += 2
-
-        self.update_chromosomes(next_chromosomes)
+    def crossover(self, fitness_function, p_c, rng: np.random.Generator, evaluate=True):
+        if p_c == 0:
+            return
 
-    def mutate(self, fitness_function, p_m):
+        n = len(self)
+        pairs = n // 2
+        parents = rng.permutation(n)
+        self.track_ones(fitness_function)
+        self.update_indices(parents)
+
+        self.genotypes = writable(self.genotypes)
+        first = self.genotypes[0 : 2 * pairs : 2]
+        second = self.genotypes[1 : 2 * pairs : 2]
+        masks = self.to_storage(crossover_masks(pairs, self.length, rng))
+
+        swapped = (first ^ second) & masks
+        if self.ones is not None:
+            gained = self.count_ones(swapped) - 2 * self.count_ones(swapped & first)
+            self.ones[0 : 2 * pairs : 2] += gained
+            self.ones[1 : 2 * pairs : 2] -= gained
+        first ^= swapped
+        second ^= swapped
+        self.invalidate()
+
+        crossed = swapped.any(axis=1)
+        self.changed[0 : 2 * pairs : 2] |= crossed
+        self.changed[1 : 2 * pairs : 2] |= crossed
+
+        if evaluate:
+            self.evaluate(fitness_function)
+
+    def mutate(self, fitness_function, p_m, rng: np.random.Generator, evaluate=True):
         if p_m == 0:
             return
-        for chromosome in self.chromosomes:
-            for i in range(0, len(chromosome.code)):
-                if random.random() < p_m:
-                    chromosome.code[i] = int(not chromosome.code[i])
-                    chromosome.fitness = fitness_function.estimate(chromosome.code)
-        self.update()
+        self.track_ones(fitness_function)
+        positions = mutation_positions(len(self) * self.length, p_m, rng)
+        rows, columns = np.divmod(positions, self.length)
+        bits = self.flip(rows, columns)
+        self.changed[rows] = True
+        if self.ones is not None:
+            self.ones += np.bincount(rows, weights=1 - 2 * bits.astype(np.int64), minlength=len(self)).astype(np.int64)
+
+        if evaluate:
+            self.evaluate(fitness_function)
 
     def get_mean_fitness(self):
-        return self.phenotypes_list.mean()
+        return self.get_derived("mean", self.phenotypes.mean)
 
     def get_max_fitness(self):
-        return self.phenotypes_list.max()
+        return self.get_derived("max", self.phenotypes.max)
 
     def get_fitness_std(self):
-        return self.phenotypes_list.std()
-
-    def get_best_genotype(self) -> list[int]:
-        best_index = self.phenotypes_list.argmax()
-        best_genotype = self.genotypes_list[best_index]
-        return best_genotype
-
-    def get_best_chromosomes(self) -> list[Chromosome]:
-        max_fitness = self.get_max_fitness()
-        best_phenotypes_indices = np.argwhere(self.phenotypes_list == max_fitness)[0].astype(np.int8)
-        best_chromosomes_duplicated = [self.chromosomes[i] for i in best_phenotypes_indices]
-        best_chromosomes_keys = set()
-        best_chromosomes = [
-            chromosome for chromosome in best_chromosomes_duplicated
-            if chromosome.key not in best_chromosomes_keys
-            and not best_chromosomes_keys.add(chromosome.key)
-        ]
-        return best_chromosomes
+        return self.get_derived("std", self.phenotypes.std)
+
+    def get_best_index(self) -> int:
+        return self.get_derived("argmax", self.phenotypes.argmax)
+
+    def get_best_genotype(self) -> np.ndarray:
+        best_index = self.get_best_index()
+        return self.get_genotype(best_index)
+
+    def get_best_genotypes(self) -> np.ndarray:
+        best_index = self.get_best_index()
+        return self.get_genotype(best_index)[None, :]
 
     def get_best_chromosome(self) -> Chromosome:
-        best_index = self.phenotypes_list.argmax()
-        best_chromosome = self.chromosomes[best_index]
-        return best_chromosome
+        best_index = self.get_best_index()
+        return Chromosome(self.get_genotype(best_index), self.phenotypes[best_index], self.keys[best_index])
+
+    def get_offspring_counts(self) -> np.ndarray:
+        return np.bincount(self.keys, minlength=len(self))
 
-    def get_keys_list(self):
-        return list(map(lambda chromosome: chromosome.key, self.chromosomes))
+    def get_reproduction_rate(self) -> float:
+        return int(np.count_nonzero(self.get_offspring_counts())) / len(self)
 
-    def get_chromosomes_copies_count(self, chromosome_sample_or_list):
-        if type(chromosome_sample_or_list) == list:
-            chromosome_list = chromosome_sample_or_list
-            return self.get_chromosomes_copy_count(chromosome_list)
+    def get_chromosomes_copies_count(self, chromosome_or_genotypes):
+        if isinstance(chromosome_or_genotypes, Chromosome):
+            return self.get_chromosomes_copies_counts(np.asarray(chromosome_or_genotypes.code)[None, :])
         else:
-            chromosome_sample = chromosome_sample_or_list
-            return self.get_chromosomes_copy_count([chromosome_sample])
-
-    def get_chromosomes_copy_count(self, chromosome_list: list[Chromosome]):
-        copies_count = 0
-        genotypes_available = [self.bin2int(genotype) for genotype in self.genotypes_list]
-        genotype_copies = {self.bin2int(chromosome.code) for chromosome in chromosome_list}
-
-        for genotype_available in genotypes_available:
-            copies_count += 1 if genotype_available in genotype_copies else 0
-        return copies_count
-
-    def bin2int(self, bits):
-        total = 0
-        for shift, j in enumerate(bits[::-1]):
-            if j:
-                total += 1 << shift
-        return total
-
-    def get_chromosomes_copies_counts(self, genotypes: list[list[int]]) -> int:
-        all_genotypes = [self.bin2int(genotype) for genotype in self.genotypes_list]
-        unique_genotypes = {self.bin2int(genotype) for genotype in genotypes}
-
-        copies_count = 0
-        for genotype in unique_genotypes:
-            copies_count += all_genotypes.count(genotype)
-        return copies_count
-
-    def update(self):
-        self.phenotypes_list = np.fromiter(
-            map(lambda chromosome: chromosome.fitness, self.chromosomes),
-            dtype=np.float64,
+            return self.get_chromosomes_copies_counts(chromosome_or_genotypes)
+
+    def get_chromosomes_copies_counts(self, genotypes: np.ndarray) -> int:
+        return self.get_genotype_index().count(self.to_storage(genotypes))
+
+    def update_indices(self, indices):
+        self.update_genotypes(
+            self.genotypes[indices],
+            self.phenotypes[indices],
+            self.keys[indices],
+            self.changed[indices],
+            None if self.ones is None else self.ones[indices],
         )
-        self.genotypes_list = list(
-            map(lambda chromosome: list(chromosome.code), self.chromosomes)
-        )
-
-    def update_rws(self, probabilities):
-        self.chromosomes = np.random.choice(self.chromosomes, len(self.chromosomes), p=probabilities).tolist()
-        self.update()
 
-    def update_chromosomes(self, chromosomes):
-        self.chromosomes = chromosomes
-        self.update()
+    def update_genotypes(self, genotypes, phenotypes, keys, changed=None, ones=None):
+        self.genotypes = genotypes
+        self.phenotypes = phenotypes
+        self.keys = keys
+        self.changed = np.zeros(len(phenotypes), dtype=bool) if changed is None else changed
+        self.ones = ones
+        self.invalidate()
 
     def override_chromosome_keys(self):
-        for index, chromosome in enumerate(self.chromosomes):
-            self.chromosomes[index] = chromosome.clone(key=index)
+        self.parents = self.keys
+        self.keys = np.arange(len(self), dtype=np.int32)
 
     def __copy__(self):
-        return Population(self.chromosomes.copy())
+        # Copies share read-only views of the buffers, whichever side writes to them first
+        # through variation takes a private copy. The source gives up write access too, so
+        # neither side can change the other's genotypes in place.
+        self.genotypes = read_only(self.genotypes)
+        self.phenotypes = read_only(self.phenotypes)
+        self.keys = read_only(self.keys)
+        return Population(
+            self.genotypes,
+            self.phenotypes,
+            self.keys,
+            self.length if self.packed else None,
+        )
@@ -1,22 +1,30 @@
-from numpy import random
-from chromosome import Chromosome
+import numpy as np
+
+from constants import PACKED
 from population import Population
+from evaluator import get_evaluator
 
 
 class PopulationFactory:
     def __init__(self, fitness_function):
         self.fitness_function = fitness_function
 
-    def generate(self, n, l):
+    def generate(self, n, l, rng: np.random.Generator | None = None):
+        rng = np.random.default_rng() if rng is None else rng
         ff_name = repr(self.fitness_function) 
 
-        chromosomes = [] if ff_name.startswith("FConst") else [self.fitness_function.generate_optimal(l)]
+        optimal = [] if ff_name.startswith("FConst") else [self.fitness_function.generate_optimal(l)]
+
+        start = len(optimal)
 
-        start = len(chromosomes)
+        genotypes = np.empty((n, l), dtype=np.uint8)
+        phenotypes = np.empty((n,), dtype=np.float64)
+        for index, chromosome in enumerate(optimal):
+            genotypes[index] = chromosome.code
+            phenotypes[index] = chromosome.fitness
 
-        for key in range(start, n):
-            code = random.binomial(n=1, p=0.5, size=l)
-            fitness = self.fitness_function.estimate(code)
-            chromosomes.append(Chromosome(code, fitness, key + 1))
+        genotypes[start:] = rng.integers(0, 2, size=(n - start, l), dtype=np.uint8)
+        phenotypes[start:] = get_evaluator().evaluate(self.fitness_function, genotypes[start:])
 
-        return Population(chromosomes)
+        population = Population(genotypes, phenotypes)
+        return population.pack() if PACKED else population
@@ -1,3 +1,4 @@
+import math
 from statistics import mean
 
 
@@ -7,10 +8,6 @@ def s(fs, f):
 
 class PressureStats:
     def __init__(self):
-        self.num_of_best = []
-        self.f_best = []
-        self.grs = []
-        self.intensities = []
         self.NI = None
         self.f_found = None
         self.f_avg = None
@@ -66,23 +63,23 @@ class PressureStats:
             "NI_GR_late": [self.grli],
         }
 
-    def calculate_intensity_coefficients(self):
-        nni = [x for x in self.intensities if x is not None]
+    def calculate_intensity_coefficients(self, intensities):
+        nni = [x for x in intensities if not math.isnan(x)]
         if len(nni) > 0:
             self.i_min = min(nni)
             self.i_max = max(nni)
             self.i_avg = mean(nni)
-            self.i_imin = self.intensities.index(self.i_min)
-            self.i_imax = self.intensities.index(self.i_max)
+            self.i_imin = intensities.index(self.i_min)
+            self.i_imax = intensities.index(self.i_max)
 
-    def calculate_growth_rate_coefficients(self):
-        if len(self.grs) > 0:
-            self.gre = self.grs[1]
-            self.gra = mean(self.grs)
+    def calculate_growth_rate_coefficients(self, grs):
+        if len(grs) > 0:
+            self.gre = grs[1]
+            self.gra = mean(grs)
 
-    def calculate(self):
-        self.calculate_intensity_coefficients()
-        self.calculate_growth_rate_coefficients()
+    def calculate(self, generations):
+        self.calculate_intensity_coefficients(generations["intensity"][1:].tolist())
+        self.calculate_growth_rate_coefficients(generations["gr"][1:].tolist())
 
     @staticmethod
     def calculate_intensity(fs, f, std):
@@ -3,6 +3,7 @@ import time
 from copy import copy
 
 from evoalgorithm import EvoAlgorithm
+from ensemble import EnsembleEvoAlgorithm
 
 def main(
     run: int,
@@ -11,17 +12,42 @@ def main(
     selection_method,
     file_name,
     *args,
+    rng=None,
+    checkpoint=None,
 ):
     ff_name = repr(fitness_function)
     sf_name = repr(selection_method)
     print(f"{file_name} for {sf_name} per {run} run: starting...")
     p_start = time.time()
     p = copy(initial_population)
-    optimal = fitness_function.get_optimal(*args)
+    optimal = fitness_function.get_optimal(len(p), p.length)
     folder_name = file_name if file_name is not None else ff_name
-    current_run = EvoAlgorithm(p, selection_method, fitness_function, optimal, *args).run(
-        run, folder_name
-    )
+    current_run = EvoAlgorithm(
+        p, selection_method, fitness_function, optimal, *args, rng=rng, checkpoint=checkpoint
+    ).run(run, folder_name)
     p_end = time.time()
     print(f"{file_name} for {sf_name} per {run} run: finished in {str(p_end - p_start)} seconds...")
     return current_run
+
+
+def main_ensemble(
+    runs: list[int],
+    fitness_function,
+    initial_populations,
+    selection_method,
+    file_name,
+    *args,
+    rngs=None,
+    checkpoint=None,
+):
+    sf_name = repr(selection_method)
+    print(f"{file_name} for {sf_name} per {runs[0]}-{runs[-1]} runs: starting...")
+    p_start = time.time()
+    p = initial_populations[0]
+    optimal = fitness_function.get_optimal(len(p), p.length)
+    current_runs = EnsembleEvoAlgorithm(
+        initial_populations, selection_method, fitness_function, optimal, *args, rngs=rngs, checkpoint=checkpoint
+    ).run()
+    p_end = time.time()
+    print(f"{file_name} for {sf_name} per {runs[0]}-{runs[-1]} runs: finished in {str(p_end - p_start)} seconds...")
+    return current_runs
@@ -0,0 +1,68 @@
+import math
+import numpy as np
+
+
+rank_tables = {}
+
+
+class RankTable:
+    def __init__(self, probabilities: np.ndarray):
+        self.probabilities = probabilities
+        self.scale = np.cumsum(probabilities)
+        self.total = float(self.scale[-1])
+        self.probabilities.flags.writeable = False
+        self.scale.flags.writeable = False
+
+
+def exponential_log_probabilities(c: float, size: int) -> np.ndarray:
+    # log of (c - 1) / (c^N - 1) * c^i for the i-th best chromosome, written so that
+    # c^N only appears inside log1p(-exp(...)) with a non-positive exponent.
+    exponents = np.arange(size, dtype=np.float64)
+    log_c = math.log(c)
+    if c < 1:
+        return exponents * log_c + math.log1p(-c) - math.log1p(-math.exp(size * log_c))
+    return (exponents - size) * log_c + math.log(c - 1) - math.log1p(-math.exp(-size * log_c))
+
+
+def get_exponential_rank_table(c: float, size: int) -> RankTable:
+    key = ("exponential", c, size)
+    if key not in rank_tables:
+        if c == 1:
+            probabilities = np.full((size,), 1 / size)
+        else:
+            probabilities = np.exp(exponential_log_probabilities(c, size))
+        rank_tables[key] = RankTable(probabilities)
+    return rank_tables[key]
+
+
+def get_linear_rank_table(s: float, size: int) -> RankTable:
+    # Expected copies fall linearly from s for the best chromosome to 2 - s for the worst.
+    key = ("linear", s, size)
+    if key not in rank_tables:
+        if size == 1:
+            probabilities = np.ones((1,))
+        else:
+            worst_rank = np.arange(size - 1, -1, -1, dtype=np.float64)
+            probabilities = (2 - s) / size + 2 * worst_rank * (s - 1) / (size * (size - 1))
+        rank_tables[key] = RankTable(probabilities)
+    return rank_tables[key]
+
+
+def rank(fitness: np.ndarray, random_keys: np.ndarray) -> np.ndarray:
+    # Best first, chromosomes with equal fitness are ordered by their random keys.
+    return np.lexsort((random_keys, -fitness))
+
+
+def top(fitness: np.ndarray, k: int, random_keys: np.ndarray) -> np.ndarray:
+    if k >= len(fitness):
+        return rank(fitness, random_keys)
+    if k < 1:
+        return np.zeros((0,), dtype=np.intp)
+
+    candidates = np.argpartition(-fitness, k - 1)[:k]
+    threshold = fitness[candidates].min()
+    better = np.flatnonzero(fitness > threshold)
+    ties = np.flatnonzero(fitness == threshold)
+    ties = ties[np.argsort(random_keys[ties], kind="stable")[: k - len(better)]]
+    selected = np.concatenate((better, ties))
+    return selected[rank(fitness[selected], random_keys[selected])]
@@ -3,8 +3,6 @@ from statistics import mean
 
 class ReproductionStats:
     def __init__(self):
-        self.rr_list = []
-        self.best_rr_list = []
         self.rr_min = None
         self.ni_rr_min = None
         self.rr_max = None
@@ -16,13 +14,14 @@ class ReproductionStats:
         self.ni_teta_max = None
         self.teta_avg = None
 
-    def calculate(self):
-        self.rr_min = min(self.rr_list)
-        self.ni_rr_min = self.rr_list.index(self.rr_min)
-        self.rr_max = max(self.rr_list)
-        self.ni_rr_max = self.rr_list.index(self.rr_max)
-        self.rr_avg = mean(self.rr_list)
-        teta_list = [1 - rr for rr in self.rr_list]
+    def calculate(self, generations):
+        rr_list = generations["rr"][1:].tolist()
+        self.rr_min = min(rr_list)
+        self.ni_rr_min = rr_list.index(self.rr_min)
+        self.rr_max = max(rr_list)
+        self.ni_rr_max = rr_list.index(self.rr_max)
+        self.rr_avg = mean(rr_list)
+        teta_list = [1 - rr for rr in rr_list]
         self.teta_min = min(teta_list)
         self.ni_teta_min = teta_list.index(self.teta_min)
         self.teta_max = max(teta_list)
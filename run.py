@@ -1,20 +1,80 @@
+import numpy as np
+
+
+# One row per generation, row 0 holds the initial population. The selection step columns
+# (s, rr, best_rr, intensity, gr) of row t describe the step that produced generation t,
+# so they are unused in row 0.
+GENERATION_DTYPE = np.dtype(
+    [
+        ("avg_fitness", np.float64),
+        ("std_fitness", np.float64),
+        ("f_best", np.float64),
+        ("s", np.float64),
+        ("intensity", np.float64),
+        ("gr", np.float64),
+        ("rr", np.float64),
+        ("best_rr", np.float64),
+        ("optimal_count", np.int32),
+        ("num_of_best", np.int32),
+    ]
+)
+
+
 class Run:
     def __init__(
         self,
-        avg_fitness_list=None,
-        std_fitness_list=None,
-        optimal_count=None,
+        generations=None,
         pressure_stats=None,
         reproduction_stats=None,
         selection_diff_stats=None,
         noise_stats=None,
         is_successful=None,
+        timings=None,
     ):
-        self.avg_fitness_list = avg_fitness_list
-        self.std_fitness_list = std_fitness_list
-        self.optimal_count = optimal_count
+        self.generations = generations
         self.pressure_stats = pressure_stats
         self.reproduction_stats = reproduction_stats
         self.selection_diff_stats = selection_diff_stats
         self.noise_stats = noise_stats
         self.is_successful = is_successful
+        self.timings = timings
+
+    @property
+    def avg_fitness_list(self):
+        return self.generations["avg_fitness"]
+
+    @property
+    def std_fitness_list(self):
+        return self.generations["std_fitness"]
+
+    @property
+    def optimal_count(self):
+        return self.generations["optimal_count"]
+
+    @property
+    def f_best(self):
+        return self.generations["f_best"]
+
+    @property
+    def num_of_best(self):
+        return self.generations["num_of_best"]
+
+    @property
+    def s_list(self):
+        return self.generations["s"][1:]
+
+    @property
+    def intensities(self):
+        return self.generations["intensity"][1:]
+
+    @property
+    def grs(self):
+        return self.generations["gr"][1:]
+
+    @property
+    def rr_list(self):
+        return self.generations["rr"][1:]
+
+    @property
+    def best_rr_list(self):
+        return self.generations["best_rr"][1:]
@@ -1,6 +1,8 @@
 from statistics import mean
 import math
 
+from timing import StageTimings
+
 
 def sigma(items):
     if len(items) < 2:
@@ -71,6 +73,7 @@ class RunsStats:
         self.noise_NI_min = None
         self.noise_NI_max = None
         self.noise_NI_avg = None
+        self.timings = StageTimings()
 
     def calculate(self):
         self.calculate_successful_runs()
@@ -80,6 +83,7 @@ class RunsStats:
         self.calculate_rr_stats()
         self.calculate_teta_stats()
         self.calculate_s_stats()
+        self.calculate_timings()
 
     def calculate_successful_runs(self):
         self.successful_runs = [run for run in self.runs if run.is_successful]
@@ -101,6 +105,12 @@ class RunsStats:
             self.noise_NI_max = max(nis)
             self.noise_NI_avg = mean(nis)
 
+    def calculate_timings(self):
+        self.timings = StageTimings()
+        for run in self.runs:
+            if run.timings is not None:
+                self.timings.merge(run.timings)
+
     def calculate_convergence_stats(self):
         convergence_iterations = [run.pressure_stats.NI for run in self.successful_runs]
         if len(convergence_iterations) > 0:
@@ -323,6 +333,9 @@ class RunsStats:
             "Noise NI avg": [self.noise_NI_avg],
         }
 
+    def as_timings_dict(self):
+        return {"Runs": [len(self.runs)], **self.timings.as_dict()}
+
     def __str__(self):
         return (
             "Suc: "
@@ -1,39 +1,37 @@
-import random
+import numpy as np
 
 from population import Population
+from ranking import get_exponential_rank_table, rank
 
 
 class RankExponentialRWS:
     def __init__(self, c: float):
         self.c = c
 
-    def exponential_rws(self, population: Population):
-        N = len(population.chromosomes)
+    def exponential_rws(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        N = len(population)
 
-        ranks = list(map(lambda index: N - index, range(0, N)))
-        probabilities = list(map(lambda rank: self.scale(N, rank), ranks))
+        table = get_exponential_rank_table(self.c, N)
 
-        if sum(probabilities) == 0:
-            return population
+        return rng.choice(N, N, p=table.probabilities)
 
-        population.update_rws(probabilities)
+    def get_parents(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        indices = rank(population.phenotypes, rng.permutation(len(population)))
+        return indices[self.exponential_rws(population, rng)]
 
-        return population
-
-    def select(self, population: Population):
-        chromosomes = population.chromosomes.copy()
-        random.shuffle(chromosomes)
-        chromosomes = self.sort(chromosomes)
-        population.update_chromosomes(chromosomes)
-        return self.exponential_rws(population)
+    def get_parents_batch(self, phenotypes: np.ndarray, rngs: list[np.random.Generator]) -> np.ndarray:
+        runs, N = phenotypes.shape
+        table = get_exponential_rank_table(self.c, N)
+        keys = np.empty((runs, N), dtype=np.int64)
+        positions = np.empty((runs, N), dtype=np.int64)
+        for row, rng in enumerate(rngs):
+            keys[row] = rng.permutation(N)
+            positions[row] = rng.choice(N, N, p=table.probabilities)
+        return np.take_along_axis(rank(phenotypes, keys), positions, axis=1)
 
-    def scale(self, size: int, rank: int) -> float:
-        return ((self.c - 1) / (pow(self.c, size) - 1)) * pow(self.c, size - rank)
-
-    def sort(self, chromosomes):
-        return sorted(
-            chromosomes.copy(), key=lambda chromosome: chromosome.fitness, reverse=True
-        )
+    def select(self, population: Population, rng: np.random.Generator):
+        population.update_indices(self.get_parents(population, rng))
+        return population
 
     def __repr__(self):
         return f"RankExponentialRWS[c={self.c}]"
@@ -0,0 +1,45 @@
+import json
+import os
+import numpy as np
+
+from constants import N, SEED
+
+
+def get_run_seeds(config_index: int, run: int, count: int) -> list[np.random.SeedSequence]:
+    # Same streams as SeedSequence(SEED).spawn(...)[config_index].spawn(...)[run].spawn(count),
+    # addressed by spawn key so a single run can be replayed without the rest of the sweep.
+    return np.random.SeedSequence(SEED, spawn_key=(config_index, run)).spawn(count)
+
+
+def get_generator(seed_sequence: np.random.SeedSequence) -> np.random.Generator:
+    return np.random.Generator(np.random.PCG64(seed_sequence))
+
+
+def get_stream_index(argument_index: int, selection_index: int, selections: int) -> int:
+    # Stream 0 of a run generates its initial population.
+    return 1 + argument_index * selections + selection_index
+
+
+def save_seed_manifest(arguments, selection_methods, runs: int):
+    manifest = {"seed": SEED, "runs": []}
+    for config_index, config_arguments in enumerate(arguments):
+        for run in range(runs):
+            manifest["runs"].append({"stream": "population", "run": run, "spawn_key": [config_index, run, 0]})
+            for argument_index, (file_name, *_) in enumerate(config_arguments):
+                for selection_index, selection_method in enumerate(selection_methods):
+                    stream = get_stream_index(argument_index, selection_index, len(selection_methods))
+                    manifest["runs"].append(
+                        {
+                            "stream": "evolution",
+                            "file_name": file_name,
+                            "selection": repr(selection_method),
+                            "run": run,
+                            "spawn_key": [config_index, run, stream],
+                        }
+                    )
+
+    path = f"Report/{N}"
+    if not os.path.exists(path):
+        os.makedirs(path, exist_ok=True)
+    with open(f"{path}/seeds.json", "w") as file:
+        json.dump(manifest, file, indent=1)
@@ -3,19 +3,19 @@ from statistics import mean
 
 class SelectionDiffStats:
     def __init__(self):
-        self.s_list = []
         self.s_min = None
         self.ni_s_min = None
         self.s_max = None
         self.ni_s_max = None
         self.s_avg = None
 
-    def calculate(self):
-        self.s_min = min(self.s_list)
-        self.ni_s_min = self.s_list.index(self.s_min)
-        self.s_max = max(self.s_list)
-        self.ni_s_max = self.s_list.index(self.s_max)
-        self.s_avg = mean(self.s_list)
+    def calculate(self, generations):
+        s_list = generations["s"][1:].tolist()
+        self.s_min = min(s_list)
+        self.ni_s_min = s_list.index(self.s_min)
+        self.s_max = max(s_list)
+        self.ni_s_max = s_list.index(self.s_max)
+        self.s_avg = mean(s_list)
 
     def __str__(self):
         return (
@@ -1,70 +1,60 @@
-import random
-
-from numpy import random
+import numpy as np
 
 from population import Population
+from ranking import RankTable, get_exponential_rank_table, rank
 
 
-def basic_sus(population: Population, probabilities: float, probability_scale: list):
-    mating_pool = []
-    number_of_parents = len(population.chromosomes)
+def basic_sus(
+    population: Population, probabilities: float, probability_scale: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    number_of_parents = len(population)
     fitness_step = probabilities / number_of_parents
-    random_offset = random.uniform(0, fitness_step)
-    current_fitness_pointer = random_offset
-    last_fitness_scale_position = 0
+    random_offset = rng.uniform(0, fitness_step)
+    pointers = random_offset + fitness_step * np.arange(number_of_parents)
+    return locate_pointers(probability_scale, pointers)
+
+
+def basic_sus_batch(phenotypes: np.ndarray, table: RankTable, rngs: list[np.random.Generator]) -> np.ndarray:
+    # Ranks and samples a stack of populations at once, every row draws from its own
+    # generator in the same order as a single population would.
+    runs, number_of_parents = phenotypes.shape
+    fitness_step = table.total / number_of_parents
+    keys = np.empty((runs, number_of_parents), dtype=np.int64)
+    offsets = np.empty((runs, 1), dtype=np.float64)
+    for row, rng in enumerate(rngs):
+        keys[row] = rng.permutation(number_of_parents)
+        offsets[row] = rng.uniform(0, fitness_step)
+    indices = rank(phenotypes, keys)
+    pointers = offsets + fitness_step * np.arange(number_of_parents)
+    return np.take_along_axis(indices, locate_pointers(table.scale, pointers), axis=1)
 
-    for _ in range(len(population.chromosomes)):
-        for fitness_scale_position in range(
-            last_fitness_scale_position, len(probability_scale)
-        ):
-            if probability_scale[fitness_scale_position] >= current_fitness_pointer:
-                mating_pool.append(population.chromosomes[fitness_scale_position])
-                last_fitness_scale_position = fitness_scale_position
-                break
-        current_fitness_pointer += fitness_step
 
-    return mating_pool
+def locate_pointers(probability_scale: np.ndarray, pointers: np.ndarray) -> np.ndarray:
+    mating_pool = np.searchsorted(probability_scale, pointers, side="left")
+    return np.minimum(mating_pool, len(probability_scale) - 1)
 
 
 class RankExponentialSUS:
     def __init__(self, c: float):
         self.c = c
 
-    def exponential_sus(self, population: Population):
-        probabilities_total = 0
-        probability_scale = []
+    def exponential_sus(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        N = len(population)
 
-        N = len(population.chromosomes)
+        table = get_exponential_rank_table(self.c, N)
 
-        ranks = list(map(lambda index: N - index, range(0, N)))
-        probabilities = list(map(lambda rank: self.scale(N, rank), ranks))
+        return basic_sus(population, table.total, table.scale, rng)
 
-        for index, probability in enumerate(probabilities):
-            probabilities_total += probability
-            if index == 0:
-                probability_scale.append(probability)
-            else:
-                probability_scale.append(probability + probability_scale[index - 1])
+    def get_parents(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        indices = rank(population.phenotypes, rng.permutation(len(population)))
+        return indices[self.exponential_sus(population, rng)]
 
-        mating_pool = basic_sus(population, probabilities_total, probability_scale)
-        population.update_chromosomes(mating_pool)
+    def get_parents_batch(self, phenotypes: np.ndarray, rngs: list[np.random.Generator]) -> np.ndarray:
+        return basic_sus_batch(phenotypes, get_exponential_rank_table(self.c, phenotypes.shape[1]), rngs)
 
+    def select(self, population: Population, rng: np.random.Generator):
+        population.update_indices(self.get_parents(population, rng))
         return population
 
-    def select(self, population: Population):
-        chromosomes = population.chromosomes.copy()
-        random.shuffle(chromosomes)
-        chromosomes = self.sort(chromosomes)
-        population.update_chromosomes(chromosomes)
-        return self.exponential_sus(population)
-
-    def scale(self, size: int, rank: int) -> float:
-        return ((self.c - 1) / (pow(self.c, size) - 1)) * pow(self.c, size - rank)
-
-    def sort(self, chromosomes):
-        return sorted(
-            chromosomes.copy(), key=lambda chromosome: chromosome.fitness, reverse=True
-        )
-
     def __repr__(self):
         return f"RankExponentialSUS[c={self.c}]"
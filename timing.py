@@ -0,0 +1,39 @@
+import time
+
+
+STAGES = ("selection", "crossover", "mutation", "evaluation", "convergence", "stats", "plots")
+
+
+class StageTimings:
+    # Cumulative seconds and calls per stage of the generation loop, plus the amount of
+    # genotypes sent to the fitness function.
+    def __init__(self, seconds=None, calls=None, evaluations=0):
+        self.seconds = dict.fromkeys(STAGES, 0.0) if seconds is None else seconds
+        self.calls = dict.fromkeys(STAGES, 0) if calls is None else calls
+        self.evaluations = evaluations
+
+    def record(self, stage: str, start: float) -> float:
+        # Returns the end of the stage, which is the start of the next one.
+        end = time.perf_counter()
+        self.seconds[stage] += end - start
+        self.calls[stage] += 1
+        return end
+
+    def merge(self, other: "StageTimings"):
+        for stage in STAGES:
+            self.seconds[stage] += other.seconds[stage]
+            self.calls[stage] += other.calls[stage]
+        self.evaluations += other.evaluations
+
+    def __str__(self):
+        return "".join(
+            f"\n{stage}: {self.seconds[stage]:.3f} s in {self.calls[stage]} calls" for stage in STAGES
+        ) + f"\nEvaluations: {self.evaluations}"
+
+    def as_dict(self):
+        dictionary = {}
+        for stage in STAGES:
+            dictionary[f"{stage}_s"] = [self.seconds[stage]]
+            dictionary[f"{stage}_calls"] = [self.calls[stage]]
+        dictionary["Evaluations"] = [self.evaluations]
+        return dictionary
@@ -0,0 +1,37 @@
+import numpy as np
+
+from population import Population
+
+
+class TournamentSelection:
+    def __init__(self, size: int, replacement: bool = True):
+        self.size = size
+        self.replacement = replacement
+
+    def contestants(self, N: int, rng: np.random.Generator) -> np.ndarray:
+        if self.replacement:
+            return rng.integers(0, N, (N, self.size))
+        # Every chromosome plays exactly `size` tournaments: the rows are cut from
+        # `size` concatenated permutations of the population.
+        rounds = rng.permuted(np.tile(np.arange(N), (self.size, 1)), axis=1)
+        return rounds.reshape(N, self.size)
+
+    def get_parents(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        contestants = self.contestants(len(population), rng)
+        winners = np.argmax(population.phenotypes[contestants], axis=1)
+        return contestants[np.arange(len(contestants)), winners]
+
+    def get_parents_batch(self, phenotypes: np.ndarray, rngs: list[np.random.Generator]) -> np.ndarray:
+        runs, N = phenotypes.shape
+        contestants = np.stack([self.contestants(N, rng) for rng in rngs])
+        fitness = np.take_along_axis(phenotypes, contestants.reshape(runs, -1), axis=1).reshape(contestants.shape)
+        winners = np.argmax(fitness, axis=2)
+        return np.take_along_axis(contestants, winners[..., None], axis=2)[..., 0]
+
+    def select(self, population: Population, rng: np.random.Generator):
+        population.update_indices(self.get_parents(population, rng))
+        return population
+
+    def __repr__(self):
+        replacement = "" if self.replacement else ",no-replacement"
+        return f"TournamentSelection[t={self.size}{replacement}]"
@@ -0,0 +1,22 @@
+import numpy as np
+
+from population import Population
+from ranking import top
+
+
+class TruncationSelection:
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+
+    def get_parents(self, population: Population, rng: np.random.Generator) -> np.ndarray:
+        N = len(population)
+        k = min(max(round(self.threshold * N), 1), N)
+        best = top(population.phenotypes, k, rng.permutation(N))
+        return best[np.arange(N) % k]
+
+    def select(self, population: Population, rng: np.random.Generator):
+        population.update_indices(self.get_parents(population, rng))
+        return population
+
+    def __repr__(self):
+        return f"TruncationSelection[T={self.threshold}]"